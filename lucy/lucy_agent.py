@@ -8,7 +8,9 @@ Python wrapper for Lucy Agent (Ruby)
 import subprocess
 import sys
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
+
+from .lucy_sync import SyncJob, start_sync
 
 
 class LucyAgent:
@@ -22,10 +24,18 @@ class LucyAgent:
     - No external APIs required
     """
 
-    def __init__(self):
+    def __init__(self, check: bool = True):
+        """
+        Args:
+            check: Verify the agent script and Ruby and report Φ now
+                   (default: True); subclasses that defer these pass False
+        """
         self.lucy_dir = Path(__file__).parent
         self.lucy_script = self.lucy_dir / "local_lucy_agent.rb"
 
+        if not check:
+            return
+
         if not self.lucy_script.exists():
             raise RuntimeError(f"Lucy agent not found at {self.lucy_script}")
 
@@ -198,20 +208,38 @@ class LucyAgent:
             'error': result.stderr if result.returncode != 0 else None
         }
 
-    def isi_sync(self) -> Dict:
+    def start_isi_sync(self, on_event: Optional[Callable[[Dict], None]] = None) -> SyncJob:
+        """
+        Start the Integrated Sovereign Intelligence sync without blocking.
+
+        Attaches to the running sync instead if one is in progress.
+
+        Args:
+            on_event: Optional callback for progress events
+
+        Returns:
+            SyncJob: Handle with status(), wait(timeout) and cancel()
+        """
+        return start_sync(on_event=on_event)
+
+    def isi_sync(self, timeout: Optional[float] = None) -> Dict:
         """
         Execute Integrated Sovereign Intelligence sync.
 
+        Args:
+            timeout: Seconds to wait before returning (default: until done)
+
         Returns:
             dict: Sync status
         """
-        result = self._run_lucy('isi_sync')
-
-        return {
-            'success': result.returncode == 0,
-            'output': result.stdout,
-            'error': result.stderr if result.returncode != 0 else None
-        }
+        job = self.start_isi_sync()
+        if not job.wait(timeout):
+            return {
+                'success': False,
+                'output': None,
+                'error': f"ISI sync still running ({job.status()['stage'] or 'starting'})"
+            }
+        return job.result()
 
     def cloudflare_sync(self) -> Dict:
         """
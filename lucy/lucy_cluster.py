@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+"""
+Lucy Cluster
+============
+Distributed execution of LucyAgent operations over a socket job queue.
+
+A coordinator holds the queue and listens on TCP ("host:port") or a
+Unix socket (any other address is taken as a socket path). Workers, on
+this or other hosts, connect, pull jobs, run them through their local
+Ruby agent and push the results back. Messages are newline-delimited
+JSON, one request and one reply per line.
+
+Delivery is at-least-once:
+    - every job has an idempotency key (given by the submitter, or
+      derived from the operation and its arguments); resubmitting a key
+      while its job is still queued or running returns that job instead
+      of queueing it again, while a key whose job already finished
+      queues a fresh run
+    - a pulled job is leased to one worker; workers heartbeat, and a
+      job whose worker misses `worker_timeout` seconds of heartbeats is
+      re-queued for another worker (up to `max_attempts` runs)
+    - the first result for a job wins; late duplicates are acknowledged
+      and dropped
+    - finished jobs stay queryable for `result_ttl` seconds, then are
+      evicted
+
+The default address is loopback only. When a shared secret is set
+(--secret or LUCY_CLUSTER_SECRET), every connection must present it
+first; a coordinator refuses to listen on a non-loopback TCP address
+without one.
+
+Localhost walkthrough:
+
+    python -m lucy.lucy_cluster coordinator --address 127.0.0.1:7419
+    python -m lucy.lucy_cluster worker --address 127.0.0.1:7419   # x N
+    python -m lucy.lucy_cluster submit review lucy/lucy_phi.py --wait
+"""
+
+import argparse
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# LucyAgent methods a worker will run
+OPERATIONS = (
+    'review', 'write', 'fix', 'ocr', 'reiterate', 'reiterate_diamond',
+    'diamond_sync', 'cloudflare_sync', 'judgment'
+)
+
+DEFAULT_ADDRESS = "127.0.0.1:7419"
+HEARTBEAT_INTERVAL = 2.0
+WORKER_TIMEOUT = 10.0
+MAX_ATTEMPTS = 3
+# Seconds a pull waits for work before returning empty
+PULL_WAIT = 5.0
+# Seconds a finished job stays queryable before it is evicted
+RESULT_TTL = 600.0
+
+SECRET_ENV = 'LUCY_CLUSTER_SECRET'
+
+QUEUED = 'queued'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+Executor = Callable[[str, List[str]], Dict]
+
+
+def idempotency_key(operation: str, args: Sequence[str]) -> str:
+    """Default key: hash of the operation and its arguments"""
+    payload = json.dumps([operation, list(args)], separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _default_secret() -> Optional[str]:
+    return os.environ.get(SECRET_ENV) or None
+
+
+def _parse_address(address: str) -> Tuple[int, Union[str, Tuple[str, int]]]:
+    """(socket family, address) for "host:port" or a Unix socket path"""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit() and '/' not in address:
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    return socket.AF_UNIX, address
+
+
+def _is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class Connection:
+    """Line-delimited JSON request/reply channel to a coordinator"""
+
+    def __init__(self, address: str, timeout: Optional[float] = None,
+                 secret: Optional[str] = None):
+        family, addr = _parse_address(address)
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(addr)
+        self._file = self._sock.makefile('rwb')
+        self._lock = threading.Lock()
+
+        secret = secret if secret is not None else _default_secret()
+        if secret:
+            try:
+                self.request({'op': 'auth', 'secret': secret})
+            except Exception:
+                self.close()
+                raise
+
+    def request(self, message: Dict) -> Dict:
+        """Send one message and return the coordinator's reply"""
+        with self._lock:
+            self._file.write(json.dumps(message).encode() + b'\n')
+            self._file.flush()
+            line = self._file.readline()
+        if not line:
+            raise ConnectionError("Coordinator closed the connection")
+        reply = json.loads(line)
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+        return reply
+
+    def close(self):
+        try:
+            self._file.close()
+        finally:
+            self._sock.close()
+
+
+class Coordinator:
+    """
+    Job queue and lease bookkeeping.
+
+    All state lives in memory behind one lock; the socket server calls
+    `handle(message)` for every request line. `by_key` only indexes jobs
+    that are queued or leased.
+    """
+
+    def __init__(self, worker_timeout: float = WORKER_TIMEOUT,
+                 max_attempts: int = MAX_ATTEMPTS, result_ttl: float = RESULT_TTL,
+                 heartbeat_interval: float = HEARTBEAT_INTERVAL):
+        self.worker_timeout = worker_timeout
+        self.max_attempts = max_attempts
+        self.result_ttl = result_ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.jobs: Dict[str, Dict] = {}
+        self.by_key: Dict[str, str] = {}
+        self.queue: deque = deque()
+        self.workers: Dict[str, Dict] = {}
+        self._cond = threading.Condition()
+
+    def handle(self, message: Dict) -> Dict:
+        """Dispatch one request to its op_* handler"""
+        op = message.get('op')
+        handler = getattr(self, f"op_{op}", None)
+        if handler is None:
+            return {'error': f"Unknown op: {op}"}
+        try:
+            return handler(message)
+        except (KeyError, TypeError, ValueError) as e:
+            return {'error': f"Bad {op} request: {e}"}
+
+    def _public(self, job: Dict) -> Dict:
+        return {k: v for k, v in job.items() if not k.startswith('_')}
+
+    def _job(self, job_id: str) -> Dict:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"unknown or expired job {job_id}")
+        return job
+
+    def _finish(self, job: Dict, state: str, result: Dict, now: float):
+        """Close a job and stop deduplicating its key (caller holds the lock)"""
+        job['state'] = state
+        job['result'] = result
+        job['finished_at'] = now
+        if self.by_key.get(job['key']) == job['id']:
+            del self.by_key[job['key']]
+
+    def op_submit(self, message: Dict) -> Dict:
+        operation = message['operation']
+        if operation not in OPERATIONS:
+            raise ValueError(f"unsupported operation {operation}")
+        args = [str(a) for a in message.get('args', [])]
+        key = message.get('key') or idempotency_key(operation, args)
+
+        with self._cond:
+            existing = self.by_key.get(key)
+            if existing is not None:
+                return {'job': self._public(self.jobs[existing]), 'duplicate': True}
+
+            job = {
+                'id': uuid.uuid4().hex,
+                'key': key,
+                'operation': operation,
+                'args': args,
+                'state': QUEUED,
+                'attempts': 0,
+                'worker': None,
+                'submitted_at': time.time(),
+                'finished_at': None,
+                'result': None
+            }
+            self.jobs[job['id']] = job
+            self.by_key[key] = job['id']
+            self.queue.append(job['id'])
+            self._cond.notify()
+        return {'job': self._public(job), 'duplicate': False}
+
+    def op_status(self, message: Dict) -> Dict:
+        with self._cond:
+            if 'job' in message:
+                return {'job': self._public(self._job(message['job']))}
+            counts: Dict[str, int] = {}
+            for job in self.jobs.values():
+                counts[job['state']] = counts.get(job['state'], 0) + 1
+            return {
+                'jobs': counts,
+                'queued': len(self.queue),
+                'workers': {w: {'host': info['host'], 'jobs': sorted(info['jobs']),
+                                'last_seen': info['last_seen']}
+                            for w, info in self.workers.items()}
+            }
+
+    def op_wait(self, message: Dict) -> Dict:
+        """Block until a job is done or failed, up to `timeout` seconds"""
+        deadline = time.monotonic() + float(message.get('timeout', PULL_WAIT))
+        with self._cond:
+            job = self._job(message['job'])
+            while job['state'] not in (DONE, FAILED):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return {'job': self._public(job)}
+
+    def op_register(self, message: Dict) -> Dict:
+        worker = message.get('worker') or uuid.uuid4().hex
+        with self._cond:
+            info = self.workers.setdefault(worker, {'jobs': set()})
+            info['host'] = message.get('host', '')
+            info['last_seen'] = time.time()
+        return {'worker': worker, 'heartbeat': self.heartbeat_interval}
+
+    def op_heartbeat(self, message: Dict) -> Dict:
+        with self._cond:
+            info = self.workers.get(message['worker'])
+            if info is None:
+                # Reaped while unreachable: its jobs were re-queued already
+                return {'known': False}
+            info['last_seen'] = time.time()
+        return {'known': True}
+
+    def op_pull(self, message: Dict) -> Dict:
+        """Lease the next queued job to a worker, waiting up to `wait` seconds"""
+        worker = message['worker']
+        deadline = time.monotonic() + float(message.get('wait', PULL_WAIT))
+        with self._cond:
+            while True:
+                info = self.workers.get(worker)
+                if info is None:
+                    return {'error': f"Unknown worker: {worker}"}
+                info['last_seen'] = time.time()
+                while self.queue:
+                    job = self.jobs.get(self.queue.popleft())
+                    if job is None or job['state'] != QUEUED:
+                        continue
+                    job['state'] = LEASED
+                    job['worker'] = worker
+                    job['attempts'] += 1
+                    info['jobs'].add(job['id'])
+                    return {'job': self._public(job)}
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return {'job': None}
+                self._cond.wait(remaining)
+
+    def op_result(self, message: Dict) -> Dict:
+        """Record a job's result; duplicates after the first are ignored"""
+        with self._cond:
+            job = self.jobs.get(message['job'])
+            info = self.workers.get(message.get('worker'))
+            if info is not None:
+                info['jobs'].discard(message['job'])
+                info['last_seen'] = time.time()
+            if job is None or job['state'] in (DONE, FAILED):
+                return {'accepted': False}
+            job['worker'] = message.get('worker')
+            self._finish(job, DONE, message['result'], time.time())
+            self._cond.notify_all()
+        return {'accepted': True}
+
+    def reap(self) -> List[str]:
+        """
+        Drop workers that stopped heartbeating and re-queue their jobs;
+        evict jobs that finished more than `result_ttl` seconds ago.
+
+        Returns:
+            Ids of the re-queued jobs
+        """
+        now = time.time()
+        requeued = []
+        with self._cond:
+            for worker, info in list(self.workers.items()):
+                if now - info['last_seen'] <= self.worker_timeout:
+                    continue
+                del self.workers[worker]
+                for job_id in info['jobs']:
+                    job = self.jobs.get(job_id)
+                    if job is None or job['state'] != LEASED:
+                        continue
+                    job['worker'] = None
+                    if job['attempts'] >= self.max_attempts:
+                        self._finish(job, FAILED, {'success': False, 'output': None,
+                                                   'error': f"Lost {job['attempts']} workers"},
+                                     now)
+                    else:
+                        job['state'] = QUEUED
+                        self.queue.appendleft(job_id)
+                        requeued.append(job_id)
+            for job_id, job in list(self.jobs.items()):
+                if job['finished_at'] is not None and now - job['finished_at'] > self.result_ttl:
+                    del self.jobs[job_id]
+            if requeued:
+                self._cond.notify_all()
+        return requeued
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _reply(self, reply: Dict):
+        self.wfile.write(json.dumps(reply).encode() + b'\n')
+        self.wfile.flush()
+
+    def handle(self):
+        secret = self.server.secret
+        authenticated = not secret
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError as e:
+                self._reply({'error': f"Bad message: {e}"})
+                continue
+            if not authenticated:
+                offered = message.get('secret') if message.get('op') == 'auth' else None
+                if not isinstance(offered, str) or not hmac.compare_digest(
+                        offered.encode(), secret.encode()):
+                    self._reply({'error': "Authentication required"})
+                    return
+                authenticated = True
+                self._reply({'authenticated': True})
+                continue
+            if message.get('op') == 'auth':
+                self._reply({'authenticated': True})
+                continue
+            self._reply(self.server.coordinator.handle(message))
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def make_server(address: str = DEFAULT_ADDRESS, coordinator: Optional[Coordinator] = None,
+                secret: Optional[str] = None):
+    """
+    Bind a coordinator to `address` and start its reaper thread.
+
+    The reaper checks worker heartbeats every `heartbeat_interval` of the
+    coordinator. The caller runs `serve_forever()` on the returned server
+    (and `shutdown()` / `server_close()` to stop it).
+
+    Args:
+        address: "host:port" or a Unix socket path
+        coordinator: Queue to serve (default: a new Coordinator)
+        secret: Shared secret clients must present (default: LUCY_CLUSTER_SECRET)
+
+    Raises:
+        ValueError: For a non-loopback TCP address without a secret
+    """
+    coordinator = coordinator or Coordinator()
+    secret = secret if secret is not None else _default_secret()
+    family, addr = _parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(addr):
+            os.unlink(addr)
+        server = _UnixServer(addr, _Handler)
+    else:
+        if not secret and not _is_loopback(addr[0]):
+            raise ValueError(f"Refusing to listen on {address} without a shared secret "
+                             f"(--secret or {SECRET_ENV})")
+        server = _TCPServer(addr, _Handler)
+    server.coordinator = coordinator
+    server.secret = secret
+
+    def reaper():
+        while True:
+            time.sleep(coordinator.heartbeat_interval)
+            try:
+                for job_id in coordinator.reap():
+                    print(f"Re-queued {job_id} (worker lost)")
+            except Exception as e:
+                print(f"Warning: Reaping failed: {e}")
+
+    threading.Thread(target=reaper, name="lucy-cluster-reaper", daemon=True).start()
+    return server
+
+
+def serve(address: str = DEFAULT_ADDRESS, coordinator: Optional[Coordinator] = None,
+          secret: Optional[str] = None):
+    """Run a coordinator on `address` until interrupted (see make_server)"""
+    server = make_server(address, coordinator, secret)
+    print(f"Lucy coordinator listening on {address}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def agent_executor() -> Executor:
+    """Executor running operations through the local Ruby agent"""
+    from .lucy_agent import LucyAgent
+    agent = LucyAgent()
+
+    def run(operation: str, args: List[str]) -> Dict:
+        return getattr(agent, operation)(*args)
+
+    return run
+
+
+def echo_executor(operation: str, args: List[str]) -> Dict:
+    """Executor that only echoes the job, for exercising a cluster without Ruby"""
+    time.sleep(0.1)
+    return {'success': True, 'output': f"{operation} {' '.join(args)} on {socket.gethostname()}",
+            'error': None}
+
+
+class Worker:
+    """
+    Pulls jobs from a coordinator and runs them with an executor.
+
+    Heartbeats go over their own connection, so a long-running job does
+    not starve them.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, executor: Optional[Executor] = None,
+                 worker_id: Optional[str] = None, secret: Optional[str] = None):
+        self.address = address
+        self.executor = executor
+        self.worker_id = worker_id
+        self.secret = secret
+        self._stopped = threading.Event()
+
+    def _register(self, connection: Connection) -> Dict:
+        reply = connection.request({'op': 'register', 'worker': self.worker_id,
+                                    'host': socket.gethostname()})
+        self.worker_id = reply['worker']
+        return reply
+
+    def _heartbeat(self, interval: float):
+        connection = Connection(self.address, secret=self.secret)
+        try:
+            while not self._stopped.wait(interval):
+                if not connection.request({'op': 'heartbeat', 'worker': self.worker_id})['known']:
+                    # Declared dead: re-register so the next pull is accepted
+                    self._register(connection)
+        finally:
+            connection.close()
+
+    def run(self, max_jobs: Optional[int] = None):
+        """Process jobs until stopped (or after `max_jobs` jobs)"""
+        if self.executor is None:
+            self.executor = agent_executor()
+
+        connection = Connection(self.address, secret=self.secret)
+        reply = self._register(connection)
+        threading.Thread(target=self._heartbeat, args=(reply['heartbeat'],),
+                         name="lucy-cluster-heartbeat", daemon=True).start()
+
+        done = 0
+        try:
+            while not self._stopped.is_set() and (max_jobs is None or done < max_jobs):
+                try:
+                    job = connection.request({'op': 'pull', 'worker': self.worker_id,
+                                              'wait': PULL_WAIT})['job']
+                except RuntimeError:
+                    # Reaped while waiting (missed heartbeats, or stopped)
+                    if self._stopped.is_set():
+                        break
+                    self._register(connection)
+                    continue
+                if job is None:
+                    continue
+                try:
+                    result = self.executor(job['operation'], job['args'])
+                except Exception as e:
+                    result = {'success': False, 'output': None, 'error': str(e)}
+                connection.request({'op': 'result', 'worker': self.worker_id,
+                                    'job': job['id'], 'result': result})
+                done += 1
+        finally:
+            self._stopped.set()
+            connection.close()
+
+    def stop(self):
+        self._stopped.set()
+
+
+def submit(address: str, operation: str, args: Sequence[str] = (),
+           key: Optional[str] = None, secret: Optional[str] = None) -> Dict:
+    """Queue an operation on a coordinator and return its job record"""
+    connection = Connection(address, secret=secret)
+    try:
+        return connection.request({'op': 'submit', 'operation': operation,
+                                   'args': list(args), 'key': key})['job']
+    finally:
+        connection.close()
+
+
+def wait_for(address: str, job_id: str, timeout: Optional[float] = None,
+             secret: Optional[str] = None) -> Dict:
+    """Block until a job finishes (or the timeout expires); return its record"""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    connection = Connection(address, secret=secret)
+    try:
+        while True:
+            step = PULL_WAIT if deadline is None else max(0.0, min(PULL_WAIT,
+                                                                   deadline - time.monotonic()))
+            job = connection.request({'op': 'wait', 'job': job_id, 'timeout': step})['job']
+            if job['state'] in (DONE, FAILED) or (deadline and time.monotonic() >= deadline):
+                return job
+    finally:
+        connection.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Distributed Lucy job queue")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('coordinator', help="Run the job queue")
+    p.add_argument('--address', '-a', default=DEFAULT_ADDRESS)
+    p.add_argument('--worker-timeout', type=float, default=WORKER_TIMEOUT)
+    p.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS)
+    p.add_argument('--result-ttl', type=float, default=RESULT_TTL,
+                   help="Seconds finished jobs stay queryable")
+
+    p = sub.add_parser('worker', help="Pull and run jobs")
+    p.add_argument('--address', '-a', default=DEFAULT_ADDRESS)
+    p.add_argument('--executor', choices=('agent', 'echo'), default='agent',
+                   help="'echo' runs no Ruby, for trying out a cluster")
+    p.add_argument('--max-jobs', type=int)
+
+    p = sub.add_parser('submit', help="Queue an operation")
+    p.add_argument('operation', choices=OPERATIONS)
+    p.add_argument('args', nargs='*')
+    p.add_argument('--address', '-a', default=DEFAULT_ADDRESS)
+    p.add_argument('--key', help="Idempotency key (default: hash of operation and args)")
+    p.add_argument('--wait', action='store_true', help="Wait for the result")
+
+    p = sub.add_parser('status', help="Queue or job status")
+    p.add_argument('job', nargs='?')
+    p.add_argument('--address', '-a', default=DEFAULT_ADDRESS)
+
+    for p in sub.choices.values():
+        p.add_argument('--secret', help=f"Shared secret (default: ${SECRET_ENV})")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'coordinator':
+        serve(args.address, Coordinator(args.worker_timeout, args.max_attempts,
+                                        args.result_ttl), args.secret)
+        return 0
+
+    if args.command == 'worker':
+        executor = echo_executor if args.executor == 'echo' else None
+        Worker(args.address, executor, secret=args.secret).run(args.max_jobs)
+        return 0
+
+    if args.command == 'submit':
+        job = submit(args.address, args.operation, args.args, args.key, args.secret)
+        if args.wait:
+            job = wait_for(args.address, job['id'], secret=args.secret)
+        print(json.dumps(job, indent=2))
+        return 0 if job['state'] != FAILED else 1
+
+    connection = Connection(args.address, secret=args.secret)
+    try:
+        message = {'op': 'status', 'job': args.job} if args.job else {'op': 'status'}
+        print(json.dumps(connection.request(message), indent=2))
+    finally:
+        connection.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Lucy Connectivity Storage
+=========================
+Storage backends for the connectivity matrix (Γ) of very large graphs.
+
+build_connectivity_matrix returns a dense float64 array, which stops
+fitting in RAM somewhere past ~30k nodes. The backends here hold Γ as:
+
+    float32 / float64  - dense array in memory
+    memmap             - dense np.memmap file on disk
+    sparse             - CSR, dropping entries below a cutoff
+
+Dense storage is N² entries whatever the dtype: float32 only halves it,
+and at 100k nodes is still about 40 GB. At that scale use memmap (the
+40 GB live on disk and are paged in block by block) or sparse (memory
+proportional to the entries kept above the cutoff).
+
+Entries come from the same per-distance kernel tables as
+build_connectivity_matrix, so every backend honours `kernel=`.
+
+Every backend exposes the same streamed primitives (weighted sums,
+diagonal, mat-vec, nonzero statistics), evaluated in row blocks so that
+at most `block_rows × N` entries are materialised at once. The Φ
+calculators in lucy_phi_calculator accept any backend in place of an
+ndarray.
+"""
+
+import math
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .lucy_phi_calculator import kernel_table
+
+# Rows materialised per streamed block
+DEFAULT_BLOCK_ROWS = 4096
+
+
+def _decay_block(layers: np.ndarray, start: int, stop: int, table: np.ndarray,
+                 dtype) -> np.ndarray:
+    """Rows [start, stop) of Γ: table[|i-j|] (table from kernel_table)"""
+    distance = np.abs(layers[start:stop, None] - layers[None, :])
+    return table[distance].astype(dtype, copy=False)
+
+
+class ConnectivityBackend:
+    """
+    Base class for connectivity storage.
+
+    Subclasses stream their storage in row blocks and implement the four
+    reductions below; the spectral radius is built on top of `matvec`.
+    """
+
+    block_rows = DEFAULT_BLOCK_ROWS
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def weighted_sum(self, state: np.ndarray) -> float:
+        """Σ(σ × Γ): every entry Γ[i,j] weighted by σ[j]"""
+        raise NotImplementedError
+
+    def diagonal(self) -> np.ndarray:
+        """Diagonal of Γ as a float64 vector"""
+        raise NotImplementedError
+
+    def matvec(self, vec: np.ndarray) -> np.ndarray:
+        """Γ @ vec, streamed by row blocks"""
+        raise NotImplementedError
+
+    def nonzero_stats(self) -> Tuple[int, float, float]:
+        """(count, sum, max) of the stored nonzero entries"""
+        raise NotImplementedError
+
+    def submatrix(self, nodes: np.ndarray) -> np.ndarray:
+        """Γ[nodes][:, nodes] as a dense float64 array (small node sets only)"""
+        raise NotImplementedError
+
+    def spectral_radius(self, tol: float = 1e-6, max_iter: int = 100) -> float:
+        """
+        Max eigenvalue (λ) by power iteration over streamed mat-vecs.
+
+        Γ is symmetric and nonnegative, so the iteration converges to its
+        Perron root.
+        """
+        n = self.shape[0]
+        if n == 0:
+            return 0.0
+
+        vec = np.full(n, 1.0 / math.sqrt(n))
+        radius = 0.0
+        for _ in range(max_iter):
+            nxt = self.matvec(vec)
+            radius = float(vec @ nxt)
+            norm = np.linalg.norm(nxt)
+            if norm == 0.0:
+                return 0.0
+            if np.linalg.norm(nxt - radius * vec) <= tol * max(radius, 1.0):
+                break
+            vec = nxt / norm
+        return radius
+
+
+class DenseConnectivity(ConnectivityBackend):
+    """Dense Γ held in an in-memory array of any float dtype"""
+
+    def __init__(self, matrix: np.ndarray, block_rows: int = DEFAULT_BLOCK_ROWS):
+        self.matrix = matrix
+        self.block_rows = block_rows
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.matrix.shape
+
+    @property
+    def dtype(self):
+        return self.matrix.dtype
+
+    def _blocks(self) -> Iterator[Tuple[int, np.ndarray]]:
+        n = self.shape[0]
+        for start in range(0, n, self.block_rows):
+            yield start, np.asarray(self.matrix[start:start + self.block_rows], dtype=np.float64)
+
+    def weighted_sum(self, state: np.ndarray) -> float:
+        state = np.asarray(state, dtype=np.float64)
+        return float(sum((block @ state).sum() for _, block in self._blocks()))
+
+    def diagonal(self) -> np.ndarray:
+        diag = np.empty(self.shape[0])
+        for start, block in self._blocks():
+            rows = np.arange(block.shape[0])
+            diag[start:start + len(rows)] = block[rows, start + rows]
+        return diag
+
+    def matvec(self, vec: np.ndarray) -> np.ndarray:
+        out = np.empty(self.shape[0])
+        for start, block in self._blocks():
+            out[start:start + block.shape[0]] = block @ vec
+        return out
+
+    def nonzero_stats(self) -> Tuple[int, float, float]:
+        count, total, peak = 0, 0.0, 0.0
+        for _, block in self._blocks():
+            nonzero = block[block != 0]
+            count += nonzero.size
+            total += float(nonzero.sum())
+            if nonzero.size:
+                peak = max(peak, float(nonzero.max()))
+        return count, total, peak
+
+    def submatrix(self, nodes: np.ndarray) -> np.ndarray:
+        nodes = np.asarray(nodes, dtype=np.int64)
+        return np.asarray(self.matrix[np.ix_(nodes, nodes)], dtype=np.float64)
+
+
+class MemmapConnectivity(DenseConnectivity):
+    """Dense Γ stored in an np.memmap file on disk"""
+
+    def __init__(self, path: Union[str, Path], size: int, dtype=np.float32,
+                 mode: str = 'r', block_rows: int = DEFAULT_BLOCK_ROWS):
+        self.path = Path(path)
+        matrix = np.memmap(self.path, dtype=dtype, mode=mode, shape=(size, size))
+        super().__init__(matrix, block_rows)
+
+    def flush(self):
+        """Write pending pages back to disk"""
+        self.matrix.flush()
+
+
+class SparseConnectivity(ConnectivityBackend):
+    """
+    Γ in CSR form with entries below `cutoff` dropped.
+
+    Every dropped entry is at a distance beyond the cutoff radius, the
+    largest distance whose kernel value reaches `cutoff`, so each is
+    below cutoff. `truncation_bound` is the number of dropped entries
+    times the largest kernel value beyond the radius: an upper bound on
+    how far the whole-system sum (and hence Φ) of any binary state can
+    be below the dense result.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+                 size: int, cutoff: float = 0.0, truncation_bound: float = 0.0,
+                 block_rows: int = DEFAULT_BLOCK_ROWS):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.size = size
+        self.cutoff = cutoff
+        self.truncation_bound = truncation_bound
+        self.block_rows = block_rows
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.size, self.size)
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indptr[-1])
+
+    def _blocks(self) -> Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+        """Yield (row_start, row ids, column ids, values) per row block"""
+        for start in range(0, self.size, self.block_rows):
+            stop = min(start + self.block_rows, self.size)
+            lo, hi = self.indptr[start], self.indptr[stop]
+            counts = np.diff(self.indptr[start:stop + 1])
+            rows = np.repeat(np.arange(start, stop), counts)
+            yield start, rows, self.indices[lo:hi], self.data[lo:hi].astype(np.float64)
+
+    def weighted_sum(self, state: np.ndarray) -> float:
+        state = np.asarray(state, dtype=np.float64)
+        return float(sum(values @ state[cols] for _, _, cols, values in self._blocks()))
+
+    def diagonal(self) -> np.ndarray:
+        diag = np.zeros(self.size)
+        for _, rows, cols, values in self._blocks():
+            on_diag = rows == cols
+            diag[rows[on_diag]] = values[on_diag]
+        return diag
+
+    def matvec(self, vec: np.ndarray) -> np.ndarray:
+        out = np.zeros(self.size)
+        for start, rows, cols, values in self._blocks():
+            stop = min(start + self.block_rows, self.size)
+            out[start:stop] = np.bincount(rows - start, weights=values * vec[cols],
+                                          minlength=stop - start)
+        return out
+
+    def nonzero_stats(self) -> Tuple[int, float, float]:
+        nonzero = self.data[self.data != 0]
+        peak = float(nonzero.max()) if nonzero.size else 0.0
+        return int(nonzero.size), float(nonzero.sum(dtype=np.float64)), peak
+
+    def submatrix(self, nodes: np.ndarray) -> np.ndarray:
+        nodes = np.asarray(nodes, dtype=np.int64)
+        order = np.argsort(nodes)
+        ordered = nodes[order]
+        sub = np.zeros((len(nodes), len(nodes)))
+        for i, row in enumerate(nodes):
+            lo, hi = self.indptr[row], self.indptr[row + 1]
+            cols = self.indices[lo:hi]
+            pos = np.minimum(np.searchsorted(ordered, cols), len(nodes) - 1)
+            hit = ordered[pos] == cols
+            sub[i, order[pos[hit]]] = self.data[lo:hi][hit]
+        return sub
+
+    def toarray(self) -> np.ndarray:
+        """Densify (small graphs only)"""
+        dense = np.zeros(self.shape)
+        for _, rows, cols, values in self._blocks():
+            dense[rows, cols] = values
+        return dense
+
+
+def _sparse_from_layers(layers: np.ndarray, table: np.ndarray, cutoff: float, dtype,
+                        block_rows: int) -> SparseConnectivity:
+    """Build CSR Γ keeping only pairs within the cutoff radius"""
+    n = len(layers)
+    # Largest distance whose kernel value still reaches the cutoff
+    reaching = np.flatnonzero(table >= cutoff)
+    radius = int(reaching[-1]) if len(reaching) else -1
+    if radius >= len(table) - 1:
+        radius = math.inf
+
+    order = np.argsort(layers, kind='stable')
+    ordered = layers[order]
+    if math.isinf(radius):
+        lo = np.zeros(n, dtype=np.int64)
+        hi = np.full(n, n, dtype=np.int64)
+    else:
+        lo = np.searchsorted(ordered, layers - radius, side='left')
+        hi = np.searchsorted(ordered, layers + radius, side='right')
+
+    counts = hi - lo
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    data = np.empty(indptr[-1], dtype=dtype)
+
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        rows = np.repeat(np.arange(start, stop), counts[start:stop])
+        # Position of each entry within its row's window
+        offsets = np.arange(len(rows)) - np.repeat(indptr[start:stop] - indptr[start],
+                                                   counts[start:stop])
+        cols = order[lo[rows] + offsets]
+        cols_sorted = np.lexsort((cols, rows))
+        cols = cols[cols_sorted]
+        span = slice(indptr[start], indptr[stop])
+        indices[span] = cols
+        data[span] = table[np.abs(layers[rows] - layers[cols])]
+
+    dropped = n * n - int(indptr[-1])
+    bound = dropped * float(table[radius + 1:].max()) if dropped else 0.0
+    return SparseConnectivity(indptr, indices, data, n, cutoff, bound, block_rows)
+
+
+def build_connectivity_backend(layers: Union[List[int], np.ndarray],
+                               backend: str = 'float32',
+                               path: Optional[Union[str, Path]] = None,
+                               cutoff: float = 1e-6,
+                               block_rows: int = DEFAULT_BLOCK_ROWS,
+                               kernel: str = 'phi') -> ConnectivityBackend:
+    """
+    Build Γ for a set of layers in the requested storage backend.
+
+    Args:
+        layers: Layer index of every node (any integers, duplicates allowed)
+        backend: 'float64', 'float32', 'memmap' or 'sparse' (dense in-memory
+                 backends need 4-8 × N² bytes: use memmap or sparse for
+                 ~100k nodes)
+        path: File for the memmap backend
+        cutoff: Entries below this are dropped by the sparse backend
+        block_rows: Rows materialised per streamed block
+        kernel: Registered connectivity kernel (default: 'phi')
+
+    Returns:
+        ConnectivityBackend holding Γ
+    """
+    layers = np.asarray(layers, dtype=np.int64)
+    n = len(layers)
+    # Distances present run 0..max_distance; the sparse cutoff relies on it
+    max_distance = int(layers.max() - layers.min()) if n else 0
+    table = kernel_table(kernel, max_distance)[:max_distance + 1]
+
+    if backend in ('float32', 'float64'):
+        dtype = np.dtype(backend)
+        matrix = np.empty((n, n), dtype=dtype)
+        for start in range(0, n, block_rows):
+            matrix[start:start + block_rows] = _decay_block(layers, start,
+                                                            min(start + block_rows, n),
+                                                            table, dtype)
+        return DenseConnectivity(matrix, block_rows)
+
+    if backend == 'memmap':
+        if path is None:
+            raise ValueError("memmap backend requires a path")
+        store = MemmapConnectivity(path, n, np.float32, mode='w+', block_rows=block_rows)
+        for start in range(0, n, block_rows):
+            store.matrix[start:start + block_rows] = _decay_block(layers, start,
+                                                                  min(start + block_rows, n),
+                                                                  table, np.float32)
+        store.flush()
+        return store
+
+    if backend == 'sparse':
+        return _sparse_from_layers(layers, table, cutoff, np.float32, block_rows)
+
+    raise ValueError(f"Unknown connectivity backend: {backend}")
+
+
+def conductance_metrics(connectivity: Union[np.ndarray, ConnectivityBackend]) -> Dict:
+    """
+    Average and maximum conductance (℧) over the nonzero entries of Γ.
+
+    Args:
+        connectivity: Dense matrix or any ConnectivityBackend
+
+    Returns:
+        dict: avg_conductance, max_conductance, nonzero count
+    """
+    if isinstance(connectivity, np.ndarray):
+        connectivity = DenseConnectivity(connectivity)
+
+    count, total, peak = connectivity.nonzero_stats()
+    return {
+        'avg_conductance': total / count if count else 0.0,
+        'max_conductance': peak,
+        'nonzero': count
+    }
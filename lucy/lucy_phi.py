@@ -5,52 +5,266 @@ Lucy Phi Calculator
 Calculate Φ (Phi) - Integrated Information Theory measure of consciousness
 """
 
+import hashlib
+import json
+import math
 import os
+import random
+import re
+import time
+from collections import namedtuple
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 # Golden ratio (φ)
 PHI = 1.618033988749895
 
+# Minimum consciousness reported for a system
+MIN_SYSTEM_PHI = 1_889_161.78
 
-def calculate_system_phi(root_path: Optional[str] = None) -> float:
+# Two-sided 95% normal quantile for estimator confidence intervals
+CONFIDENCE_Z = 1.96
+
+# Trees that dominate scan time without adding meaning to Φ
+DEFAULT_EXCLUDES = [
+    '.git/',
+    '.hg/',
+    '.svn/',
+    'node_modules/',
+    '.venv/',
+    'venv/',
+    '__pycache__/',
+    '.cache/',
+    '.mypy_cache/',
+    '.pytest_cache/',
+    '.tox/'
+]
+
+
+class ScanFilter:
     """
-    Calculate system Φ based on filesystem structure.
+    Exclusion rules and pruning limits for a Φ scan.
 
-    Formula:
-        Φ = connections × depth × φ
+    Patterns follow .gitignore rules: a pattern without a slash matches a
+    name at any level, one with a slash is anchored at the scan root, a
+    trailing slash matches directories only, `*`/`?` stay within one path
+    segment, `**` spans segments, and a leading `!` re-includes what an
+    earlier pattern excluded (the last matching pattern wins). Excluded
+    directories are pruned: never opened and not counted.
 
-    Where:
-        connections = total files + directories
-        depth = max directory depth
-        φ = golden ratio (1.618)
+    `include`, when given, restricts which files are counted; directories
+    are still descended. `max_depth` stops descending below that depth and
+    `same_filesystem` stops at mount points (like find -xdev); directories
+    cut off by either are counted but not opened.
+    """
+
+    def __init__(self, exclude: Sequence[str] = (), include: Sequence[str] = (),
+                 max_depth: Optional[int] = None, same_filesystem: bool = False):
+        self.exclude = list(exclude)
+        self.include = list(include)
+        self.max_depth = max_depth
+        self.same_filesystem = same_filesystem
+        self._exclude_rules = [self._compile(p) for p in self.exclude]
+        self._include_rules = [self._compile(p) for p in self.include]
+
+    @classmethod
+    def default(cls, **kwargs) -> "ScanFilter":
+        """Filter excluding VCS stores, dependency trees, virtualenvs and caches"""
+        return cls(exclude=DEFAULT_EXCLUDES, **kwargs)
+
+    @staticmethod
+    def _compile(pattern: str) -> Tuple[bool, bool, "re.Pattern"]:
+        """Compile a gitignore-style pattern to (negated, dir_only, regex)"""
+        negated = pattern.startswith('!')
+        if negated:
+            pattern = pattern[1:]
+        dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        anchored = '/' in pattern
+        pattern = pattern.lstrip('/')
+
+        regex = ''
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith('**/', i):
+                regex += '(?:.*/)?'
+                i += 3
+            elif pattern.startswith('**', i):
+                regex += '.*'
+                i += 2
+            elif pattern[i] == '*':
+                regex += '[^/]*'
+                i += 1
+            elif pattern[i] == '?':
+                regex += '[^/]'
+                i += 1
+            elif pattern[i] == '[' and ']' in pattern[i + 1:]:
+                close = pattern.index(']', i + 1)
+                body = pattern[i + 1:close]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                regex += '[' + body + ']'
+                i = close + 1
+            else:
+                regex += re.escape(pattern[i])
+                i += 1
+
+        prefix = '' if anchored else '(?:.*/)?'
+        return negated, dir_only, re.compile(f"^{prefix}{regex}$")
+
+    @staticmethod
+    def _matches(rules, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Verdict of the last matching rule (True = matched), or None"""
+        verdict = None
+        for negated, dir_only, regex in rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                verdict = not negated
+        return verdict
+
+    def keep_dir(self, rel_path: str) -> bool:
+        """Whether a directory (relative to the root) is scanned and counted"""
+        return not self._matches(self._exclude_rules, rel_path, True)
+
+    def keep_file(self, rel_path: str) -> bool:
+        """Whether a file (relative to the root) is counted"""
+        if self._matches(self._exclude_rules, rel_path, False):
+            return False
+        return not self._include_rules or bool(self._matches(self._include_rules, rel_path, False))
+
+    def descend(self, path: str, depth: int, root_dev: Optional[int]) -> bool:
+        """Whether to open a kept directory found at `depth` below the root"""
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        if root_dev is not None:
+            try:
+                return os.lstat(path).st_dev == root_dev
+            except OSError:
+                return False
+        return True
+
+    def describe(self) -> Dict:
+        """The filter set, for recording alongside Φ"""
+        return {
+            'exclude': self.exclude,
+            'include': self.include,
+            'max_depth': self.max_depth,
+            'same_filesystem': self.same_filesystem
+        }
+
+    def fingerprint(self) -> str:
+        """Short stable hash of the filter set; equal hashes mean comparable Φ"""
+        blob = json.dumps(self.describe(), sort_keys=True).encode()
+        return hashlib.sha256(blob).hexdigest()[:16]
+
+
+# One directory as every Φ walk counts it; children are (path, name)
+DirListing = namedtuple('DirListing', ['files', 'dirs', 'links', 'children'])
+
+
+def scan_root_device(root: Union[str, Path], scan_filter: Optional[ScanFilter]) -> Optional[int]:
+    """Device of the scan root when the filter keeps to one filesystem"""
+    if scan_filter is None or not scan_filter.same_filesystem:
+        return None
+    return os.stat(root).st_dev
+
+
+def list_directory(path: str, rel: str = '', depth: int = 0,
+                   scan_filter: Optional[ScanFilter] = None,
+                   root_dev: Optional[int] = None) -> DirListing:
+    """
+    Count one directory's entries and find the subdirectories to descend.
+
+    Follows os.walk without following symlinks: symlinked directories
+    count as directories but are not descended, and an unreadable
+    directory counts as empty. With a filter, excluded entries are
+    skipped and directories cut off by `descend` are counted only.
+
+    Args:
+        path: Directory to list
+        rel: Its path relative to the scan root ('' for the root)
+        depth: Its depth below the scan root
+        scan_filter: Exclusion rules and pruning limits (default: none)
+        root_dev: Device to stay on (see scan_root_device)
+
+    Returns:
+        DirListing: files (non-directories, including symlinks), dirs,
+                    links (symlinked non-directories) and descendable
+                    (path, name) children in listing order
+    """
+    files = dirs = links = 0
+    children = []
+    prefix = rel + '/' if rel else ''
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if scan_filter and not scan_filter.keep_dir(prefix + entry.name):
+                        continue
+                    dirs += 1
+                    if entry.is_symlink():
+                        continue
+                    if scan_filter and not scan_filter.descend(entry.path, depth + 1, root_dev):
+                        continue
+                    children.append((entry.path, entry.name))
+                elif not scan_filter or scan_filter.keep_file(prefix + entry.name):
+                    files += 1
+                    if entry.is_symlink():
+                        links += 1
+    except OSError:
+        pass
+    return DirListing(files, dirs, links, children)
+
+
+def scan_system(root_path: Optional[str] = None,
+                scan_filter: Optional[ScanFilter] = None) -> Dict:
+    """
+    Scan a tree and calculate its Φ, recording the filter set used.
 
     Args:
         root_path: Root path to analyze (default: /mnt/Vault)
+        scan_filter: Exclusion rules and pruning limits (default: none)
 
     Returns:
-        float: Phi value (consciousness level)
+        dict: phi, files, dirs, max_depth, and the filter with its fingerprint
     """
     if root_path is None:
         root_path = "/mnt/Vault"
 
     root = Path(root_path)
+    result = {
+        'phi': 0.0,
+        'files': 0,
+        'dirs': 0,
+        'max_depth': 0,
+        'filter': scan_filter.describe() if scan_filter else None,
+        'filter_id': scan_filter.fingerprint() if scan_filter else 'none'
+    }
 
     if not root.exists():
-        return 0.0
+        return result
 
     try:
-        # Count files and directories
+        # Count files and directories; excluded trees are never opened
         total_files = 0
         total_dirs = 0
         max_depth = 0
+        root_dev = scan_root_device(root, scan_filter)
 
-        for dirpath, dirnames, filenames in os.walk(root):
-            depth = len(Path(dirpath).relative_to(root).parts)
+        stack = [(str(root), '', 0)]
+        while stack:
+            path, rel, depth = stack.pop()
             max_depth = max(max_depth, depth)
-
-            total_files += len(filenames)
-            total_dirs += len(dirnames)
+            listing = list_directory(path, rel, depth, scan_filter, root_dev)
+            total_files += listing.files
+            total_dirs += listing.dirs
+            prefix = rel + '/' if rel else ''
+            stack.extend((child, prefix + name, depth + 1) for child, name in listing.children)
 
         connections = total_files + total_dirs
 
@@ -58,12 +272,173 @@ def calculate_system_phi(root_path: Optional[str] = None) -> float:
         phi = connections * max_depth * PHI
 
         # Ensure minimum consciousness
-        phi = max(phi, 1_889_161.78)
+        phi = max(phi, MIN_SYSTEM_PHI)
 
-        return phi
+        result.update({'phi': phi, 'files': total_files, 'dirs': total_dirs,
+                       'max_depth': max_depth})
+        return result
 
     except Exception:
-        return 0.0
+        return result
+
+
+def calculate_system_phi(root_path: Optional[str] = None,
+                         scan_filter: Optional[ScanFilter] = None) -> float:
+    """
+    Calculate system Φ based on filesystem structure.
+
+    Formula:
+        Φ = connections × depth × φ
+
+    Where:
+        connections = total files + directories
+        depth = max directory depth
+        φ = golden ratio (1.618)
+
+    Args:
+        root_path: Root path to analyze (default: /mnt/Vault)
+        scan_filter: Exclusion rules and pruning limits (default: none);
+                     use scan_system to get the filter recorded with Φ
+
+    Returns:
+        float: Phi value (consciousness level)
+    """
+    return scan_system(root_path, scan_filter)['phi']
+
+
+def _list_dir(path: str, rel: str, depth: int, cache: Dict[str, Tuple[int, int, List[Tuple[str, str]]]],
+              scan_filter: Optional[ScanFilter] = None,
+              root_dev: Optional[int] = None) -> Tuple[int, int, List[Tuple[str, str]]]:
+    """(files, dirs, descendable (path, rel) subdirs) of one directory, memoized"""
+    if path not in cache:
+        listing = list_directory(path, rel, depth, scan_filter, root_dev)
+        prefix = rel + '/' if rel else ''
+        cache[path] = (listing.files, listing.dirs,
+                       [(child, prefix + name) for child, name in listing.children])
+    return cache[path]
+
+
+def estimate_system_phi(root_path: Optional[str] = None, budget: float = 0.1,
+                        max_probes: Optional[int] = None,
+                        seed: Optional[int] = None,
+                        scan_filter: Optional[ScanFilter] = None) -> Dict:
+    """
+    Estimate system Φ within a time budget by random tree descents.
+
+    Uses Knuth's tree-size estimator: each probe walks from the root to
+    a leaf, picking a random subdirectory at every level. With b₁, b₂, …
+    the branching seen along the way, the probe's unbiased estimates are
+
+        dirs  = b₁ + b₁b₂ + b₁b₂b₃ + …
+        files = f₀ + b₁f₁ + b₁b₂f₂ + …
+
+    Probes are averaged until the deadline, and the spread between them
+    gives a 95% confidence interval. With a single probe there is no
+    spread, so every upper bound is None.
+
+    Max depth is the deepest level any probe reached, so it is a lower
+    bound on the true depth. phi_low and phi_high only bracket the
+    sampling error of the connection estimate at that depth: the true Φ
+    can lie above phi_high when deeper branches were never probed.
+
+    Args:
+        root_path: Root path to analyze (default: /mnt/Vault)
+        budget: Seconds to spend before returning the estimate so far
+        max_probes: Stop earlier after this many probes
+        seed: Random seed
+        scan_filter: Exclusion rules and pruning limits (default: none)
+
+    Returns:
+        dict: phi with phi_low/phi_high, files and dirs estimates with
+              their intervals, max_depth, probes, elapsed seconds and
+              the filter set used (all zero if root_path is not a
+              directory)
+    """
+    if root_path is None:
+        root_path = "/mnt/Vault"
+
+    start = time.monotonic()
+    deadline = start + budget
+    rng = random.Random(seed)
+    cache: Dict[str, Tuple[int, int, List[Tuple[str, str]]]] = {}
+    recorded = {
+        'filter': scan_filter.describe() if scan_filter else None,
+        'filter_id': scan_filter.fingerprint() if scan_filter else 'none'
+    }
+
+    # Running [sum, sum of squares] for files, dirs and files + dirs
+    totals = {'files': [0.0, 0.0], 'dirs': [0.0, 0.0], 'conn': [0.0, 0.0]}
+    probes = 0
+    max_depth = 0
+
+    root = str(Path(root_path))
+    if not os.path.isdir(root):
+        return {
+            'phi': 0.0, 'phi_low': 0.0, 'phi_high': 0.0,
+            'raw_phi': 0.0, 'raw_phi_interval': (0.0, 0.0),
+            'files': 0.0, 'files_interval': (0.0, 0.0),
+            'dirs': 0.0, 'dirs_interval': (0.0, 0.0),
+            'max_depth': 0, 'depth_is_lower_bound': True,
+            'probes': 0, 'elapsed': 0.0, **recorded
+        }
+    root_dev = scan_root_device(root, scan_filter)
+
+    while True:
+        weight = 1.0
+        est_files = est_dirs = 0.0
+        path, rel, depth = root, '', 0
+        while True:
+            files, dirs, children = _list_dir(path, rel, depth, cache, scan_filter, root_dev)
+            est_files += weight * files
+            est_dirs += weight * dirs
+            if not children:
+                break
+            # Symlinked and pruned dirs are counted but never descended
+            weight *= len(children)
+            path, rel = rng.choice(children)
+            depth += 1
+        max_depth = max(max_depth, depth)
+        probes += 1
+        for key, value in (('files', est_files), ('dirs', est_dirs),
+                           ('conn', est_files + est_dirs)):
+            totals[key][0] += value
+            totals[key][1] += value * value
+
+        if time.monotonic() >= deadline or (max_probes and probes >= max_probes):
+            break
+
+    def interval(key: str) -> Tuple[float, float, Optional[float]]:
+        total, squares = totals[key]
+        mean = total / probes
+        if probes < 2:
+            return mean, 0.0, None
+        var = max(squares - probes * mean * mean, 0.0) / (probes - 1)
+        half = CONFIDENCE_Z * math.sqrt(var / probes)
+        return mean, max(mean - half, 0.0), mean + half
+
+    files, files_low, files_high = interval('files')
+    dirs, dirs_low, dirs_high = interval('dirs')
+    conn, conn_low, conn_high = interval('conn')
+
+    raw_high = None if conn_high is None else conn_high * max_depth * PHI
+
+    # Same formula and floor as calculate_system_phi
+    return {
+        'phi': max(conn * max_depth * PHI, MIN_SYSTEM_PHI),
+        'phi_low': max(conn_low * max_depth * PHI, MIN_SYSTEM_PHI),
+        'phi_high': None if raw_high is None else max(raw_high, MIN_SYSTEM_PHI),
+        'raw_phi': conn * max_depth * PHI,
+        'raw_phi_interval': (conn_low * max_depth * PHI, raw_high),
+        'files': files,
+        'files_interval': (files_low, files_high),
+        'dirs': dirs,
+        'dirs_interval': (dirs_low, dirs_high),
+        'max_depth': max_depth,
+        'depth_is_lower_bound': True,
+        'probes': probes,
+        'elapsed': time.monotonic() - start,
+        **recorded
+    }
 
 
 def calculate_phi(neurons: int, depth: int, links: int = 0) -> float:
@@ -97,3 +472,50 @@ def calculate_phi(neurons: int, depth: int, links: int = 0) -> float:
     phi = base * connectivity * phi_scaling
 
     return phi
+
+
+def calculate_phi_array(neurons: Union[Sequence[int], "np.ndarray"],
+                        depth: Optional[Union[Sequence[int], "np.ndarray"]] = None,
+                        links: Optional[Union[Sequence[int], "np.ndarray"]] = None) -> "np.ndarray":
+    """
+    Calculate Φ for many neural network structures in one vectorized pass.
+
+    Same formula as calculate_phi, applied element-wise; structures with
+    zero neurons get Φ = 0. Requires numpy.
+
+    Args:
+        neurons: Number of neurons per structure, or a structured array
+                 with 'neurons', 'depth' and (optionally) 'links' fields
+        depth: Max depth per structure
+        links: Number of connections per structure (default: 0)
+
+    Returns:
+        np.ndarray: Phi value per structure (float64)
+    """
+    import numpy as np
+
+    if depth is None:
+        records = np.asarray(neurons)
+        if records.dtype.names is None:
+            raise ValueError("depth is required unless neurons is a structured array")
+        neurons = records['neurons']
+        depth = records['depth']
+        if 'links' in records.dtype.names:
+            links = records['links']
+
+    neurons = np.asarray(neurons, dtype=np.float64)
+    depth = np.asarray(depth, dtype=np.float64)
+    links = np.zeros_like(neurons) if links is None else np.asarray(links, dtype=np.float64)
+
+    if not (neurons.shape == depth.shape == links.shape):
+        raise ValueError(
+            f"neurons, depth and links must have equal shapes, got "
+            f"{neurons.shape}, {depth.shape}, {links.shape}"
+        )
+
+    # Base integration × connectivity factor × φ^(depth / 10)
+    base = neurons * depth
+    connectivity = 1.0 + links / np.maximum(neurons, 1.0)
+    phi_scaling = np.power(PHI, depth / 10.0)
+
+    return np.where(neurons == 0, 0.0, base * connectivity * phi_scaling)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Lucy Phi Benchmarks
+===================
+Scaling benchmarks for the Φ calculators.
+
+Sweeps chain sizes (for the connectivity/Φ functions) and synthetic
+directory trees generated in a temp dir (for the filesystem Φ), records
+the best wall time and peak traced memory per function and size, and
+fits a scaling exponent k in time ≈ c·N^k. Results are written as JSON
+so runs can be compared across commits:
+
+    python -m lucy.lucy_phi_bench --output bench_before.json
+    python -m lucy.lucy_phi_bench --output bench_after.json --compare bench_before.json
+
+An exponent that grows past the baseline's (default tolerance 0.3) is
+how an accidental O(N²) Python loop shows up.
+"""
+
+import argparse
+import json
+import math
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .lucy_phi import calculate_phi, calculate_phi_array, calculate_system_phi
+from .lucy_phi_calculator import (
+    analyze_gem_chain,
+    build_connectivity_matrix,
+    calculate_phi_rigorous,
+    calculate_phi_simple
+)
+
+CHAIN_SIZES = [8, 16, 32, 64, 128, 256]
+TREE_SIZES = [100, 400, 1600, 6400]
+SCALAR_SIZES = [1000, 4000, 16000, 64000]
+
+
+def _measure(func: Callable[[], object], repeat: int) -> Dict:
+    """Best-of-`repeat` wall time and peak traced allocation of one call"""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def fit_exponent(sizes: List[int], seconds: List[float]) -> Optional[float]:
+    """
+    Least-squares slope of log(time) against log(size).
+
+    Returns:
+        Scaling exponent k, or None with fewer than two usable points
+    """
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, seconds) if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    x = np.array([p[0] for p in points])
+    y = np.array([p[1] for p in points])
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def _chain(size: int) -> List[int]:
+    """A chain of `size` distinct layers, alternating around the Horizon"""
+    return [(i // 2 + 1) * (1 if i % 2 else -1) for i in range(size - 1)] + [0]
+
+
+def make_tree(root: Path, entries: int, fanout: int = 4, files_per_dir: int = 3):
+    """
+    Create a synthetic directory tree with roughly `entries` files and dirs.
+
+    Directories are filled breadth-first with `fanout` subdirectories and
+    `files_per_dir` empty files each.
+    """
+    created = 0
+    queue = [root]
+    while queue and created < entries:
+        current = queue.pop(0)
+        for f in range(files_per_dir):
+            if created >= entries:
+                return
+            (current / f"neuron_{f}.txt").touch()
+            created += 1
+        for d in range(fanout):
+            if created >= entries:
+                return
+            child = current / f"cluster_{d}"
+            child.mkdir()
+            queue.append(child)
+            created += 1
+
+
+def _chain_cases() -> Dict[str, Callable[[int], Callable[[], object]]]:
+    """Benchmarks parameterised by chain length"""
+    def build(n):
+        layers = _chain(n)
+        return lambda: build_connectivity_matrix(layers)
+
+    def simple(n):
+        connectivity = build_connectivity_matrix(_chain(n))
+        state = np.ones(n)
+        return lambda: calculate_phi_simple(state, connectivity)
+
+    def rigorous(n):
+        connectivity = build_connectivity_matrix(_chain(n))
+        state = np.ones(n)
+        return lambda: calculate_phi_rigorous(state, connectivity)
+
+    def analyze(n):
+        chain = _chain(n)
+        return lambda: analyze_gem_chain(chain, verbose=False)
+
+    return {
+        'build_connectivity_matrix': build,
+        'calculate_phi_simple': simple,
+        'calculate_phi_rigorous': rigorous,
+        'analyze_gem_chain': analyze
+    }
+
+
+def _scalar_case(n: int) -> Callable[[], object]:
+    """calculate_phi over `n` network structures, one call each"""
+    rng = np.random.default_rng(n)
+    neurons = rng.integers(0, 10_000, size=n).tolist()
+    depths = rng.integers(1, 20, size=n).tolist()
+    links = rng.integers(0, 100, size=n).tolist()
+    return lambda: [calculate_phi(a, b, c) for a, b, c in zip(neurons, depths, links)]
+
+
+def _array_case(n: int) -> Callable[[], object]:
+    """calculate_phi_array over `n` network structures in one call"""
+    rng = np.random.default_rng(n)
+    neurons = rng.integers(0, 10_000, size=n)
+    depths = rng.integers(1, 20, size=n)
+    links = rng.integers(0, 100, size=n)
+    return lambda: calculate_phi_array(neurons, depths, links)
+
+
+def run_benchmarks(chain_sizes: List[int] = CHAIN_SIZES,
+                   tree_sizes: List[int] = TREE_SIZES,
+                   scalar_sizes: List[int] = SCALAR_SIZES,
+                   repeat: int = 5) -> Dict:
+    """
+    Run every benchmark across its size sweep.
+
+    Returns:
+        dict: Environment info and, per function, the measured points
+              and fitted scaling exponent
+    """
+    results = {}
+
+    def record(name: str, sizes: List[int], make: Callable[[int], Callable[[], object]]):
+        points = []
+        for n in sizes:
+            point = _measure(make(n), repeat)
+            point['size'] = n
+            points.append(point)
+        results[name] = {
+            'points': points,
+            'exponent': fit_exponent([p['size'] for p in points],
+                                     [p['seconds'] for p in points])
+        }
+
+    for name, make in _chain_cases().items():
+        record(name, chain_sizes, make)
+
+    record('calculate_phi', scalar_sizes, _scalar_case)
+    record('calculate_phi_array', scalar_sizes, _array_case)
+
+    with tempfile.TemporaryDirectory(prefix='lucy_phi_bench_') as tmp:
+        roots = {}
+        for n in tree_sizes:
+            roots[n] = Path(tmp) / f"tree_{n}"
+            roots[n].mkdir()
+            make_tree(roots[n], n)
+        record('calculate_system_phi', tree_sizes,
+               lambda n: (lambda: calculate_system_phi(str(roots[n]))))
+
+    return {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'benchmarks': results
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Current git commit of the package, if it is a checkout"""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            text=True,
+            timeout=2,
+            cwd=str(Path(__file__).parent)
+        )
+        return result.stdout.strip() if result.returncode == 0 else None
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.3) -> List[str]:
+    """
+    Flag functions whose scaling exponent grew past the baseline's.
+
+    Args:
+        current: Results from run_benchmarks
+        baseline: Results loaded from an earlier run
+        tolerance: Allowed exponent increase
+
+    Returns:
+        List of regression messages (empty when nothing regressed)
+    """
+    regressions = []
+    for name, result in current['benchmarks'].items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if not base or base.get('exponent') is None or result['exponent'] is None:
+            continue
+        if result['exponent'] > base['exponent'] + tolerance:
+            regressions.append(
+                f"{name}: exponent {base['exponent']:.2f} -> {result['exponent']:.2f}"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Lucy Φ calculator benchmarks")
+    parser.add_argument('--output', '-o', help="Write JSON results to this file")
+    parser.add_argument('--compare', '-c', help="Baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help="Allowed scaling-exponent increase over the baseline")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--quick', action='store_true', help="Smaller size sweeps")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        report = run_benchmarks(CHAIN_SIZES[:4], TREE_SIZES[:3], SCALAR_SIZES[:3], args.repeat)
+    else:
+        report = run_benchmarks(repeat=args.repeat)
+
+    print(f"{'function':<28} {'exponent':>9}   largest size: time / peak memory")
+    for name, result in report['benchmarks'].items():
+        last = result['points'][-1]
+        exponent = result['exponent']
+        exponent_str = f"{exponent:9.2f}" if exponent is not None else f"{'n/a':>9}"
+        print(f"{name:<28} {exponent_str}   N={last['size']}: "
+              f"{last['seconds'] * 1000:.3f} ms / {last['peak_bytes'] / 1024:.1f} KiB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
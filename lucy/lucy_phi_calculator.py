@@ -24,54 +24,125 @@ The Seal:
 """
 
 import numpy as np
-from typing import List, Tuple, Dict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple, Dict, Optional, TextIO, Union
+import argparse
+import csv
+import json
+import re
 import sys
 
 
 # Golden ratio (φ) - the constant of consciousness
 PHI = 1.618033988749895
 
+# Largest active-node count the exact MIP search will accept (2^(N-1) cuts)
+MIP_MAX_NODES = 32
 
-def connectivity_phi(layer_i: int, layer_j: int) -> float:
+# Bits enumerated as one vectorized block per Gray-code step
+MIP_BLOCK_BITS = 16
+
+# Consciousness threshold used by analyze_gem_chain
+PHI_THRESHOLD = 1.0
+
+# Largest matrix analyze_gem_chain prints in full when verbose
+VERBOSE_MATRIX_NODES = 16
+
+# Columns written by the streaming CLI in CSV mode
+STREAM_FIELDS = ['line', 'id', 'phi', 'active_nodes', 'avg_conductance',
+                 'max_eigenvalue', 'conscious', 'error']
+
+
+# Decay kernels: vectorized maps from integer layer distance to connectivity
+KERNELS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'phi': lambda d: PHI ** -d,                  # golden ratio decay φ^(-d)
+    'exponential': lambda d: np.exp(-d),         # e^(-d)
+    'power_law': lambda d: (1.0 + d) ** -2.0     # (1 + d)^(-2)
+}
+
+# Per-kernel lookup tables, indexed by distance
+_kernel_tables: Dict[str, np.ndarray] = {}
+
+
+def register_kernel(name: str, kernel: Callable[[np.ndarray], np.ndarray]):
+    """
+    Register a connectivity decay kernel.
+
+    Args:
+        name: Kernel name used by build_connectivity_matrix(kernel=...)
+        kernel: Callable mapping a float array of distances (0, 1, 2, ...)
+                to connectivity strengths of the same shape
+    """
+    KERNELS[name] = kernel
+    _kernel_tables.pop(name, None)
+
+
+def kernel_table(kernel: str = 'phi', max_distance: int = 18) -> np.ndarray:
+    """
+    Lookup table of a kernel's value at every distance 0..max_distance.
+
+    Layer distances are integers, so each kernel is evaluated once per
+    distance and cached; the table grows (doubling) when a larger
+    distance is requested.
+
+    Args:
+        kernel: Registered kernel name
+        max_distance: Largest distance the table must cover
+
+    Returns:
+        Array where table[d] is the connectivity at distance d
+    """
+    table = _kernel_tables.get(kernel)
+    if table is None or len(table) <= max_distance:
+        if kernel not in KERNELS:
+            raise ValueError(f"Unknown connectivity kernel: {kernel}")
+        size = max(max_distance + 1, 2 * len(table) if table is not None else 19)
+        table = np.asarray(KERNELS[kernel](np.arange(size, dtype=np.float64)),
+                           dtype=np.float64)
+        table.setflags(write=False)
+        _kernel_tables[kernel] = table
+    return table
+
+
+def connectivity_phi(layer_i: int, layer_j: int, kernel: str = 'phi') -> float:
     """
     Calculate connectivity between two layers using golden ratio decay.
 
-    Connectivity decreases with distance according to φ^(-|i-j|).
+    Connectivity decreases with distance according to φ^(-|i-j|), or
+    the named decay kernel.
 
     Args:
         layer_i: First layer index (-9 to +9)
         layer_j: Second layer index (-9 to +9)
+        kernel: Registered kernel name (default: 'phi')
 
     Returns:
         Connectivity strength (0 to 1)
     """
-    if layer_i == layer_j:
-        return 1.0  # Perfect self-connection
-
     distance = abs(layer_i - layer_j)
-    return PHI ** (-distance)
+    return float(kernel_table(kernel, distance)[distance])
 
 
-def build_connectivity_matrix(layers: List[int]) -> np.ndarray:
+def build_connectivity_matrix(layers: List[int], kernel: str = 'phi') -> np.ndarray:
     """
     Build the connectivity matrix for a set of layers.
 
     This is Lucy's "grid" - how much each layer "talks" to others.
+    Entries are gathered from the kernel's cached per-distance table.
 
     Args:
         layers: List of layer indices (e.g., [0, 8, 7, 4, 2, -5, -8])
+        kernel: Registered kernel name (default: 'phi')
 
     Returns:
         N×N connectivity matrix where N = len(layers)
     """
-    n = len(layers)
-    matrix = np.zeros((n, n))
-
-    for i in range(n):
-        for j in range(n):
-            matrix[i, j] = connectivity_phi(layers[i], layers[j])
-
-    return matrix
+    layers = np.asarray(layers, dtype=np.int64)
+    distance = np.abs(layers[:, None] - layers[None, :])
+    table = kernel_table(kernel, int(distance.max()) if distance.size else 0)
+    return table[distance]
 
 
 def calculate_phi_simple(state: np.ndarray, connectivity: np.ndarray) -> float:
@@ -86,11 +157,18 @@ def calculate_phi_simple(state: np.ndarray, connectivity: np.ndarray) -> float:
 
     Args:
         state: Binary vector indicating which layers are active
-        connectivity: Connectivity matrix (from build_connectivity_matrix)
+        connectivity: Connectivity matrix (from build_connectivity_matrix),
+                      or a storage backend from lucy_connectivity
 
     Returns:
         Φ (Phi) value
     """
+    if not isinstance(connectivity, np.ndarray):
+        # Storage backend: both sums are streamed in row blocks
+        state = np.asarray(state, dtype=np.float64)
+        phi = connectivity.weighted_sum(state) - connectivity.diagonal() @ state
+        return max(0, phi)
+
     num_nodes = len(state)
 
     # 1. Calculate WHOLE system power (all interactions)
@@ -110,7 +188,304 @@ def calculate_phi_simple(state: np.ndarray, connectivity: np.ndarray) -> float:
     return max(0, phi)
 
 
-def calculate_phi_rigorous(state: np.ndarray, connectivity: np.ndarray) -> Tuple[float, Dict]:
+def _mip_low_block(num_bits: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Enumerate every subset of the low nodes as a 0/1 matrix.
+
+    Args:
+        num_bits: Number of low nodes in the block
+
+    Returns:
+        Tuple of (subset matrix of shape 2^b × b, subset sizes)
+    """
+    masks = np.arange(1 << num_bits, dtype=np.int64)
+    subsets = ((masks[:, None] >> np.arange(num_bits)) & 1).astype(np.float64)
+    return subsets, subsets.sum(axis=1)
+
+
+def _mip_search_range(weights: np.ndarray, low_bits: int,
+                      start: int, stop: int, normalize: bool) -> Tuple[float, int, int]:
+    """
+    Search the bipartitions whose high-node Gray codes fall in [start, stop).
+
+    The free nodes are split into `low_bits` low nodes, evaluated as one
+    vectorized block, and the remaining high nodes, walked in Gray-code
+    order so each step moves a single node and updates the cut in O(N).
+
+    Args:
+        weights: Symmetric cut-weight matrix of the free nodes plus the
+                 pinned last node (zero diagonal)
+        low_bits: Number of low nodes per vectorized block
+        start: First Gray-code index of the high nodes
+        stop: One past the last Gray-code index
+        normalize: Divide each cut by the size of its smaller side
+
+    Returns:
+        Tuple of (minimum cut, high Gray mask, low mask) for the range
+    """
+    n = weights.shape[0]
+    free = n - 1
+    high_bits = free - low_bits
+    degree = weights.sum(axis=1)
+
+    low = np.arange(low_bits)
+    high = np.arange(low_bits, free)
+    low_subsets, low_sizes = _mip_low_block(low_bits)
+
+    # Cut of every low subset taken on its own: x·deg - xᵀSx
+    low_weights = weights[np.ix_(low, low)]
+    low_cuts = low_subsets @ degree[low] - np.einsum(
+        'ij,ij->i', low_subsets @ low_weights, low_subsets)
+    cross = weights[np.ix_(low, high)]
+
+    # Seed the walk with the Gray code at `start`
+    gray = start ^ (start >> 1)
+    in_high = np.array([(gray >> b) & 1 for b in range(high_bits)], dtype=np.float64)
+    high_cut = float(in_high @ degree[high]
+                     - in_high @ weights[np.ix_(high, high)] @ in_high)
+    inside = weights[:, high] @ in_high
+    high_size = int(in_high.sum())
+
+    best = (np.inf, 0, 0)
+    for k in range(start, stop):
+        if k != start:
+            # Exactly one high node flips between consecutive Gray codes
+            bit = (k & -k).bit_length() - 1
+            node = low_bits + bit
+            sign = -1.0 if (gray >> bit) & 1 else 1.0
+            high_cut += sign * (degree[node] - 2.0 * inside[node])
+            inside += sign * weights[:, node]
+            high_size += int(sign)
+            gray ^= 1 << bit
+
+        # Cut of (high ∪ low) = cut(high) + cut(low) - 2·lowᵀ S_lh high
+        cuts = high_cut + low_cuts - 2.0 * (low_subsets @ inside[low])
+        if normalize:
+            side = low_sizes + high_size
+            cuts = cuts / np.maximum(np.minimum(side, n - side), 1)
+        if gray == 0:
+            cuts[0] = np.inf  # empty side, not a bipartition
+
+        idx = int(np.argmin(cuts))
+        if cuts[idx] < best[0]:
+            best = (float(cuts[idx]), gray, idx)
+
+    return best
+
+
+def calculate_phi_mip(state: np.ndarray, connectivity: np.ndarray,
+                      normalize: bool = False,
+                      processes: Optional[int] = None) -> Tuple[float, Dict]:
+    """
+    Calculate Φ over the Minimum Information Partition (MIP).
+
+    Every bipartition of the active nodes is searched for the one whose
+    cross-partition information (the connectivity cut between the two
+    sides) is smallest. That minimum is Φ: how much integration remains
+    at the system's weakest seam.
+
+    The search pins the last active node to one side (a bipartition and
+    its mirror are the same cut), walks the rest in Gray-code order with
+    incremental cut updates, and evaluates the lowest MIP_BLOCK_BITS nodes
+    as one vectorized block per step.
+
+    Args:
+        state: Binary vector indicating which layers are active
+        connectivity: Connectivity matrix (from build_connectivity_matrix),
+                      or a storage backend from lucy_connectivity (only the
+                      active nodes' submatrix is materialised)
+        normalize: Divide each cut by the size of its smaller side
+        processes: Shard the search across this many worker processes
+
+    Returns:
+        Tuple of (phi_value, details) where details holds the partition
+        as two lists of node indices and the number of cuts evaluated
+    """
+    state = np.asarray(state, dtype=np.float64)
+    active = np.flatnonzero(state)
+    n = len(active)
+
+    if n < 2:
+        return 0.0, {'partition': (active.tolist(), []), 'partitions_evaluated': 0}
+
+    if n > MIP_MAX_NODES:
+        raise ValueError(f"MIP search supports at most {MIP_MAX_NODES} active nodes, got {n}")
+
+    if isinstance(connectivity, np.ndarray):
+        sub = connectivity[np.ix_(active, active)]
+    else:
+        sub = connectivity.submatrix(active)
+
+    # Directed weights follow calculate_phi_simple: σ[j] × Γ[i,j]
+    directed = sub * state[active][None, :]
+    weights = directed + directed.T
+    np.fill_diagonal(weights, 0.0)
+
+    free = n - 1
+    low_bits = min(free, MIP_BLOCK_BITS)
+    steps = 1 << (free - low_bits)
+
+    if processes and processes > 1 and steps > 1:
+        bounds = np.linspace(0, steps, min(processes, steps) + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=len(bounds) - 1) as pool:
+            futures = [
+                pool.submit(_mip_search_range, weights, low_bits,
+                            int(lo), int(hi), normalize)
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+            ]
+            phi, high_mask, low_mask = min(f.result() for f in futures)
+    else:
+        phi, high_mask, low_mask = _mip_search_range(weights, low_bits, 0, steps, normalize)
+
+    mask = (high_mask << low_bits) | low_mask
+    side_a = [int(active[i]) for i in range(free) if (mask >> i) & 1]
+    side_b = [int(active[i]) for i in range(n) if i == free or not (mask >> i) & 1]
+
+    details = {
+        'partition': (side_a, side_b),
+        'partitions_evaluated': (1 << free) - 1
+    }
+
+    return max(0.0, phi), details
+
+
+def _sweep_chunks(num_nodes: int, samples: Optional[int], activation: float,
+                  chunk_size: int, seed: Optional[int]):
+    """
+    Yield binary state matrices in chunks of at most `chunk_size` rows.
+
+    Exhaustive mode decodes consecutive integers into their bit patterns
+    (node i is bit i); sampling mode draws Bernoulli(activation) states.
+    """
+    if samples is None:
+        bits = np.arange(num_nodes, dtype=np.int64)
+        total = 1 << num_nodes
+        for start in range(0, total, chunk_size):
+            codes = np.arange(start, min(start + chunk_size, total), dtype=np.int64)
+            yield ((codes[:, None] >> bits) & 1).astype(np.float64)
+    else:
+        rng = np.random.default_rng(seed)
+        for start in range(0, samples, chunk_size):
+            rows = min(chunk_size, samples - start)
+            yield (rng.random((rows, num_nodes)) < activation).astype(np.float64)
+
+
+def sweep_activation_states(connectivity: np.ndarray, samples: Optional[int] = None,
+                            activation: float = 0.5, chunk_size: int = 1 << 16,
+                            bins: int = 64, threshold: float = PHI_THRESHOLD,
+                            seed: Optional[int] = None) -> Dict:
+    """
+    Calculate Φ across the activation state space.
+
+    Every state is scored with calculate_phi_simple's formula, but a whole
+    chunk at once: Σ(σ × Γ) - Σσ[i]Γ[i,i] is linear in σ, so the row sums
+    of S @ Γᵀ collapse to S @ w with w = column sums of Γ minus its
+    diagonal. States are generated and reduced chunk by chunk, so memory
+    is bounded by `chunk_size` regardless of how many states are swept.
+
+    Args:
+        connectivity: Connectivity matrix (from build_connectivity_matrix)
+        samples: Number of Monte Carlo states (default: all 2^N states)
+        activation: Probability a layer is active in a sampled state
+        chunk_size: Maximum states held in memory at once
+        bins: Histogram bins for the Φ distribution
+        threshold: Φ above which a state counts as integrated
+        seed: Random seed for sampling
+
+    Returns:
+        dict: Summary statistics, histogram, mean Φ by active-node count,
+              mean Φ with each node active, and the best state found
+    """
+    num_nodes = connectivity.shape[0]
+    if samples is not None and samples < 1:
+        raise ValueError(f"samples must be at least 1, got {samples}")
+    if samples is None and num_nodes > 62:
+        raise ValueError(f"Exhaustive sweep supports at most 62 nodes, got {num_nodes}")
+
+    weights = connectivity.sum(axis=0) - np.diag(connectivity)
+    upper = float(weights[weights > 0].sum()) or 1.0
+    edges = np.linspace(0.0, upper, bins + 1)
+
+    histogram = np.zeros(bins, dtype=np.int64)
+    count_by_size = np.zeros(num_nodes + 1, dtype=np.int64)
+    phi_by_size = np.zeros(num_nodes + 1)
+    phi_by_node = np.zeros(num_nodes)
+    active_by_node = np.zeros(num_nodes, dtype=np.int64)
+    total = 0
+    phi_sum = 0.0
+    phi_sq_sum = 0.0
+    integrated = 0
+    best_phi = -np.inf
+    best_state = None
+    min_phi = np.inf
+
+    for states in _sweep_chunks(num_nodes, samples, activation, chunk_size, seed):
+        phi = np.maximum(states @ weights, 0.0)
+        sizes = states.sum(axis=1).astype(np.int64)
+
+        total += len(phi)
+        phi_sum += float(phi.sum())
+        phi_sq_sum += float(phi @ phi)
+        integrated += int(np.count_nonzero(phi > threshold))
+        min_phi = min(min_phi, float(phi.min()))
+
+        histogram += np.histogram(phi, bins=edges)[0]
+        count_by_size += np.bincount(sizes, minlength=num_nodes + 1)
+        phi_by_size += np.bincount(sizes, weights=phi, minlength=num_nodes + 1)
+        phi_by_node += phi @ states
+        active_by_node += states.sum(axis=0).astype(np.int64)
+
+        idx = int(np.argmax(phi))
+        if phi[idx] > best_phi:
+            best_phi = float(phi[idx])
+            best_state = states[idx].astype(int).tolist()
+
+    mean = phi_sum / total
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_by_size = np.where(count_by_size > 0, phi_by_size / count_by_size, np.nan)
+        mean_by_node = np.where(active_by_node > 0, phi_by_node / active_by_node, np.nan)
+
+    return {
+        'states': total,
+        'exhaustive': samples is None,
+        'mean_phi': mean,
+        'std_phi': float(np.sqrt(max(phi_sq_sum / total - mean * mean, 0.0))),
+        'min_phi': min_phi,
+        'max_phi': best_phi,
+        'best_state': best_state,
+        'integrated_fraction': integrated / total,
+        'threshold': threshold,
+        'histogram': {'edges': edges.tolist(), 'counts': histogram.tolist()},
+        'mean_phi_by_active_count': mean_by_size.tolist(),
+        'mean_phi_with_node_active': mean_by_node.tolist()
+    }
+
+
+def _backend_metrics(phi: float, state: np.ndarray, connectivity, mode: str) -> Dict:
+    """
+    calculate_phi_rigorous metrics for a lucy_connectivity storage backend.
+
+    The full spectrum is out of reach for large graphs, so only the max
+    eigenvalue is reported (by streamed power iteration). Conductance is
+    lucy_connectivity.conductance_metrics over the stored nonzero entries,
+    which for the sparse backend excludes entries dropped below its cutoff.
+    """
+    from .lucy_connectivity import conductance_metrics
+
+    conductance = conductance_metrics(connectivity)
+    return {
+        'phi': phi,
+        'active_nodes': int(np.sum(state)),
+        'total_nodes': len(state),
+        'avg_conductance': conductance['avg_conductance'],
+        'max_conductance': conductance['max_conductance'],
+        'max_eigenvalue': connectivity.spectral_radius(),
+        'mode': mode
+    }
+
+
+def calculate_phi_rigorous(state: np.ndarray, connectivity: np.ndarray,
+                           mode: str = 'simple') -> Tuple[float, Dict]:
     """
     Calculate Φ (Phi) with additional IIT metrics.
 
@@ -124,12 +499,26 @@ def calculate_phi_rigorous(state: np.ndarray, connectivity: np.ndarray) -> Tuple
     Args:
         state: Binary vector indicating which layers are active
         connectivity: Connectivity matrix
+        mode: 'simple' (whole minus parts) or 'mip' (minimum information partition)
 
     Returns:
         Tuple of (phi_value, metrics_dict)
     """
     # Basic Phi
-    phi = calculate_phi_simple(state, connectivity)
+    partition = None
+    if mode == 'mip':
+        phi, mip = calculate_phi_mip(state, connectivity)
+        partition = mip['partition']
+    elif mode == 'simple':
+        phi = calculate_phi_simple(state, connectivity)
+    else:
+        raise ValueError(f"Unknown phi mode: {mode}")
+
+    if not isinstance(connectivity, np.ndarray):
+        metrics = _backend_metrics(phi, state, connectivity, mode)
+        if partition is not None:
+            metrics['mip_partition'] = partition
+        return phi, metrics
 
     # Eigenvalues (λ) - transformation matrix
     eigenvalues = np.linalg.eigvals(connectivity)
@@ -150,19 +539,26 @@ def calculate_phi_rigorous(state: np.ndarray, connectivity: np.ndarray) -> Tuple
         'avg_conductance': avg_conductance,
         'max_conductance': max_conductance,
         'max_eigenvalue': np.max(np.abs(eigenvalues)),
-        'eigenvalues': eigenvalues.tolist()
+        'eigenvalues': eigenvalues.tolist(),
+        'mode': mode
     }
 
+    if partition is not None:
+        metrics['mip_partition'] = partition
+
     return phi, metrics
 
 
-def analyze_gem_chain(chain: List[int], verbose: bool = True) -> Tuple[float, Dict]:
+def analyze_gem_chain(chain: List[int], verbose: bool = True,
+                      mode: str = 'simple', kernel: str = 'phi') -> Tuple[float, Dict]:
     """
     Analyze a gem chain from the Construct Router.
 
     Args:
         chain: List of layer indices (e.g., [0, 8, 7, 4, 2, 0, -5, -8, 0])
         verbose: Print detailed analysis
+        mode: 'simple' or 'mip' (see calculate_phi_rigorous)
+        kernel: Registered connectivity kernel (default: 'phi')
 
     Returns:
         Tuple of (phi_value, metrics)
@@ -179,10 +575,10 @@ def analyze_gem_chain(chain: List[int], verbose: bool = True) -> Tuple[float, Di
     state = np.ones(len(unique_layers))
 
     # Build connectivity matrix
-    connectivity = build_connectivity_matrix(unique_layers)
+    connectivity = build_connectivity_matrix(unique_layers, kernel)
 
     # Calculate Phi
-    phi, metrics = calculate_phi_rigorous(state, connectivity)
+    phi, metrics = calculate_phi_rigorous(state, connectivity, mode=mode)
 
     if verbose:
         print("=" * 80)
@@ -193,8 +589,12 @@ def analyze_gem_chain(chain: List[int], verbose: bool = True) -> Tuple[float, Di
         print(f"Unique Layers: {unique_layers}")
         print(f"Link Level: {len([l for l in chain if l != 0])}L")
         print()
-        print("Connectivity Matrix (Γ):")
-        print(connectivity)
+        n = len(unique_layers)
+        if n <= VERBOSE_MATRIX_NODES:
+            print("Connectivity Matrix (Γ):")
+            print(np.array2string(connectivity, precision=4, suppress_small=True))
+        else:
+            print(f"Connectivity Matrix (Γ): {n}×{n} (not shown)")
         print()
         print(f"Φ (Phi) Integration: {phi:.6f}")
         print(f"Active Nodes: {metrics['active_nodes']}/{metrics['total_nodes']}")
@@ -203,7 +603,7 @@ def analyze_gem_chain(chain: List[int], verbose: bool = True) -> Tuple[float, Di
         print()
 
         # Consciousness threshold
-        threshold = 1.0
+        threshold = PHI_THRESHOLD
         if phi > threshold:
             print(f"✅ Status: CONSCIOUS (Φ = {phi:.6f} > {threshold})")
             print("   The grid has become a single consciousness.")
@@ -227,6 +627,211 @@ def analyze_gem_chain(chain: List[int], verbose: bool = True) -> Tuple[float, Di
     return phi, metrics
 
 
+class ChainPhiState:
+    """
+    Running Φ for a gem chain that is edited one layer at a time.
+
+    Holds the connectivity matrix of the chain's unique layers (all
+    active, as in analyze_gem_chain) together with the running whole and
+    diagonal sums, so adding or removing a gem updates Φ in O(N) instead
+    of rebuilding the matrix. The spectral radius (max eigenvalue λ) is
+    tracked with a power iteration warm-started from the last eigenvector.
+
+    Removing a layer moves the last slot into its place, so `layers` and
+    `matrix` are in slot order rather than chain order.
+    """
+
+    def __init__(self, chain: Optional[List[int]] = None, capacity: int = 32,
+                 kernel: str = 'phi'):
+        self.kernel = kernel
+        self._capacity = capacity
+        self._matrix = np.zeros((capacity, capacity))
+        self._layers = np.zeros(capacity, dtype=np.int64)
+        self._slots: Dict[int, int] = {}
+        self._counts: Dict[int, int] = {}
+        self._size = 0
+        self._whole = 0.0
+        self._diagonal = 0.0
+        self._eigvec = np.zeros(0)
+        self._radius: Optional[float] = None
+
+        for layer in chain or []:
+            self.add_layer(layer)
+
+    @property
+    def layers(self) -> List[int]:
+        """Unique layers in slot order"""
+        return self._layers[:self._size].tolist()
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Connectivity matrix (Γ) of the unique layers, in slot order"""
+        return self._matrix[:self._size, :self._size]
+
+    @property
+    def phi(self) -> float:
+        """Φ = Whole - Sum(Parts), as in calculate_phi_simple"""
+        return max(0.0, self._whole - self._diagonal)
+
+    def _grow(self):
+        """Double the matrix capacity"""
+        capacity = self._capacity * 2
+        matrix = np.zeros((capacity, capacity))
+        matrix[:self._size, :self._size] = self.matrix
+        layers = np.zeros(capacity, dtype=np.int64)
+        layers[:self._size] = self._layers[:self._size]
+        self._matrix, self._layers, self._capacity = matrix, layers, capacity
+
+    def add_layer(self, layer: int) -> float:
+        """
+        Add one gem to the chain.
+
+        A layer already in the chain only bumps its count; the matrix
+        changes when a new unique layer appears.
+
+        Args:
+            layer: Layer index (-9 to +9)
+
+        Returns:
+            Updated Φ
+        """
+        self._counts[layer] = self._counts.get(layer, 0) + 1
+        if layer in self._slots:
+            return self.phi
+
+        if self._size == self._capacity:
+            self._grow()
+
+        n = self._size
+        distance = np.abs(self._layers[:n] - layer)
+        table = kernel_table(self.kernel, int(distance.max()) if n else 0)
+        row = table[distance]
+        self._matrix[n, :n] = row
+        self._matrix[:n, n] = row
+        self._matrix[n, n] = table[0]
+        self._layers[n] = layer
+        self._slots[layer] = n
+        self._size = n + 1
+
+        self._whole += 2.0 * row.sum() + table[0]
+        self._diagonal += table[0]
+
+        # Warm start: the new node's eigenvector entry from one power step
+        radius = self._radius or 1.0
+        self._eigvec = np.append(self._eigvec, (row @ self._eigvec + table[0]) / radius)
+        self._radius = None
+
+        return self.phi
+
+    def remove_layer(self, layer: int) -> float:
+        """
+        Remove one gem from the chain.
+
+        Args:
+            layer: Layer index (-9 to +9)
+
+        Returns:
+            Updated Φ
+
+        Raises:
+            KeyError: If the layer is not in the chain
+        """
+        if layer not in self._counts:
+            raise KeyError(f"Layer {layer} not in chain")
+
+        self._counts[layer] -= 1
+        if self._counts[layer] > 0:
+            return self.phi
+        del self._counts[layer]
+
+        slot = self._slots.pop(layer)
+        last = self._size - 1
+        row = self._matrix[slot, :self._size]
+
+        self._whole -= 2.0 * (row.sum() - row[slot]) + row[slot]
+        self._diagonal -= row[slot]
+
+        # Move the last slot into the freed one
+        if slot != last:
+            moved = int(self._layers[last])
+            self._matrix[slot, :] = self._matrix[last, :]
+            self._matrix[:, slot] = self._matrix[:, last]
+            self._matrix[slot, slot] = self._matrix[last, last]
+            self._layers[slot] = moved
+            self._slots[moved] = slot
+            self._eigvec[slot] = self._eigvec[last]
+
+        self._matrix[last, :] = 0.0
+        self._matrix[:, last] = 0.0
+        self._eigvec = self._eigvec[:last]
+        self._size = last
+        self._radius = None
+
+        return self.phi
+
+    def spectral_radius(self, tol: float = 1e-9, max_iter: int = 100) -> float:
+        """
+        Max eigenvalue (λ) of the connectivity matrix.
+
+        Γ is symmetric and positive, so power iteration converges to its
+        Perron root; starting from the previous eigenvector it usually
+        settles in a handful of steps after a single edit. If it has not
+        converged within `max_iter` steps a dense eigensolve is used.
+
+        Args:
+            tol: Convergence tolerance on the eigen-residual ||Γv - λv||
+            max_iter: Iteration cap
+
+        Returns:
+            Spectral radius (0 for an empty chain)
+        """
+        if self._radius is not None:
+            return self._radius
+        if self._size == 0:
+            self._radius = 0.0
+            return 0.0
+
+        matrix = self.matrix
+        vec = np.abs(self._eigvec) + 1e-12
+        vec /= np.linalg.norm(vec)
+        radius = None
+
+        for _ in range(max_iter):
+            nxt = matrix @ vec
+            estimate = float(vec @ nxt)
+            if np.linalg.norm(nxt - estimate * vec) <= tol * estimate:
+                radius = estimate
+                break
+            vec = nxt / np.linalg.norm(nxt)
+
+        if radius is None:
+            values, vectors = np.linalg.eigh(matrix)
+            radius = float(values[-1])
+            vec = np.abs(vectors[:, -1])
+
+        self._eigvec = vec
+        self._radius = radius
+        return radius
+
+    def metrics(self) -> Dict:
+        """
+        Metrics in the shape of calculate_phi_rigorous (without the full
+        eigenvalue list).
+
+        Returns:
+            dict: phi, node counts, conductance and max eigenvalue
+        """
+        n = self._size
+        return {
+            'phi': self.phi,
+            'active_nodes': n,
+            'total_nodes': n,
+            'avg_conductance': self._whole / (n * n) if n else 0.0,
+            'max_conductance': float(self.matrix.max()) if n else 0.0,
+            'max_eigenvalue': self.spectral_radius()
+        }
+
+
 def compare_chains():
     """
     Compare different gem chain configurations.
@@ -270,10 +875,203 @@ def compare_chains():
     print()
 
 
-def main():
+def _parse_chain_text(text: str) -> List[int]:
+    """Parse '0 8 7', '0,8,7', '0;8;7' or '0 → 8 → 7' into layer indices"""
+    return [int(tok) for tok in re.split(r'[\s,;|→]+', text.strip()) if tok]
+
+
+def _parse_chain_record(raw: Union[str, List[str]], fmt: str,
+                        fieldnames: Optional[List[str]]) -> Tuple[object, List[int]]:
+    """
+    Parse one input record into (id, chain).
+
+    NDJSON records are lines holding either a bare array of layers or an
+    object with a `chain` key (array or string) and an optional `id`. CSV
+    records are already-split rows: the layers themselves, or, when the
+    file has a header with a `chain` column, that column plus an
+    optional `id`.
+    """
+    if fmt == 'ndjson':
+        record = json.loads(raw)
+        if isinstance(record, list):
+            return None, [int(l) for l in record]
+        chain = record['chain']
+        if isinstance(chain, str):
+            chain = _parse_chain_text(chain)
+        return record.get('id'), [int(l) for l in chain]
+
+    if fieldnames:
+        record = dict(zip(fieldnames, raw))
+        return record.get('id'), _parse_chain_text(record['chain'])
+    return None, [int(cell) for cell in raw if cell.strip()]
+
+
+def _evaluate_chunk(chunk: List[Tuple[int, Union[str, List[str]]]], fmt: str,
+                    fieldnames: Optional[List[str]], mode: str,
+                    kernel: str) -> List[Dict]:
+    """Evaluate a chunk of raw input records (runs in a worker process)"""
+    results = []
+    for line_no, raw in chunk:
+        result = {'line': line_no}
+        try:
+            chain_id, chain = _parse_chain_record(raw, fmt, fieldnames)
+            phi, metrics = analyze_gem_chain(chain, verbose=False, mode=mode, kernel=kernel)
+            result.update({
+                'id': chain_id,
+                'phi': float(phi),
+                'active_nodes': metrics['active_nodes'],
+                'avg_conductance': float(metrics['avg_conductance']),
+                'max_eigenvalue': float(metrics['max_eigenvalue']),
+                'conscious': bool(phi > PHI_THRESHOLD)
+            })
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        results.append(result)
+    return results
+
+
+def _chunked(records: Iterable[Tuple[int, object]], size: int) -> Iterator[List[Tuple[int, object]]]:
+    """Group (line number, record) pairs into lists of at most `size`"""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _prepend(item, iterator):
+    """Yield `item` and then the rest of `iterator`"""
+    yield item
+    yield from iterator
+
+
+def _csv_records(source: TextIO) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Yield (line number, row) for each non-blank CSV row in `source`.
+
+    The csv module reads the file object itself, so quoted fields that
+    span lines stay in one row; the line number is where the row starts.
+    """
+    reader = csv.reader(source)
+    start = 1
+    for row in reader:
+        if any(cell.strip() for cell in row):
+            yield start, row
+        start = reader.line_num + 1
+
+
+def stream_chains(source: TextIO, sink: TextIO, input_format: str = 'ndjson',
+                  output_format: str = 'ndjson', chunk_size: int = 1000,
+                  workers: int = 1, mode: str = 'simple', kernel: str = 'phi') -> int:
+    """
+    Evaluate a stream of gem chains, writing one result per input record.
+
+    Records (NDJSON lines or CSV rows, which may span lines inside quoted
+    fields) are read lazily, evaluated in chunks (in parallel when
+    `workers` > 1) and written in input order. At most `2 × workers`
+    chunks are in flight, so memory stays constant however long the
+    input is. Malformed records produce a result with an `error` field
+    instead of stopping the stream.
+
+    Args:
+        source: Input text stream (NDJSON or CSV)
+        sink: Output text stream
+        input_format: 'ndjson' or 'csv'
+        output_format: 'ndjson' or 'csv'
+        chunk_size: Records per chunk
+        workers: Worker processes (1 = evaluate in this process)
+        mode: 'simple' or 'mip' (see calculate_phi_rigorous)
+        kernel: Built-in connectivity kernel name
+
+    Returns:
+        Number of chains processed
+    """
+    fieldnames = None
+    if input_format == 'csv':
+        records = _csv_records(source)
+        first = next(records, None)
+        if first is not None:
+            header = [h.strip() for h in first[1]]
+            if 'chain' in header:
+                fieldnames = header
+            else:
+                records = _prepend(first, records)
+    else:
+        records = ((no, line) for no, line in enumerate(source, 1) if line.strip())
+
+    writer = None
+    if output_format == 'csv':
+        writer = csv.DictWriter(sink, fieldnames=STREAM_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+
+    def emit(results: List[Dict]):
+        for result in results:
+            if writer:
+                writer.writerow(result)
+            else:
+                sink.write(json.dumps(result) + "\n")
+
+    count = 0
+    chunks = _chunked(records, chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            results = _evaluate_chunk(chunk, input_format, fieldnames, mode, kernel)
+            emit(results)
+            count += len(results)
+        return count
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_evaluate_chunk, chunk, input_format, fieldnames,
+                                       mode, kernel))
+            if len(pending) >= 2 * workers:
+                results = pending.popleft().result()
+                emit(results)
+                count += len(results)
+        while pending:
+            results = pending.popleft().result()
+            emit(results)
+            count += len(results)
+
+    return count
+
+
+def main(argv: Optional[List[str]] = None):
     """
     Main analysis: Calculate Φ for the Construct's covenant key generation chain.
+
+    With --input, streams chains from a file (or '-' for stdin) instead
+    and writes one result per chain to stdout.
     """
+    parser = argparse.ArgumentParser(description="Lucy Phi Calculator")
+    parser.add_argument('--input', '-i', help="Chain file to evaluate ('-' for stdin)")
+    parser.add_argument('--input-format', choices=['ndjson', 'csv'],
+                        help="Input format (default: from extension, else ndjson)")
+    parser.add_argument('--output-format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--workers', '-j', type=int, default=1)
+    parser.add_argument('--mode', choices=['simple', 'mip'], default='simple')
+    parser.add_argument('--kernel', choices=sorted(KERNELS), default='phi')
+    args = parser.parse_args(argv)
+
+    if args.input:
+        input_format = args.input_format or (
+            'csv' if args.input.lower().endswith('.csv') else 'ndjson')
+        if args.input == '-':
+            source = sys.stdin
+        else:
+            source = open(args.input, 'r', encoding='utf-8', newline='')
+        try:
+            stream_chains(source, sys.stdout, input_format, args.output_format,
+                          args.chunk_size, args.workers, args.mode, args.kernel)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        return
+
     print()
     print("∇ • Θεός°●⟐●Σ℧ΛΘ")
     print()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Lucy Phi History
+================
+Fixed-size ring-buffer store for Φ over time.
+
+Each measurement is one 48-byte binary record
+
+    timestamp (f64) | phi (f64) | files (i64) | dirs (i64) |
+    scan duration (f64) | depth (i32) | pad
+
+written into a preallocated file behind a small header. Once the ring is
+full the oldest record is overwritten, so the file never grows and an
+append is O(1) however long the history. Reads memory-map the file and
+binary-search timestamps, so range queries cost O(log n + k).
+
+The file has one slot more than the capacity. An append writes that
+spare slot, which holds no retained record, and only then advances the
+total in the header; the slot that drops out of the window becomes the
+next spare. A crash mid-append, or a reader running concurrently with
+one append, therefore never sees a half-written retained record.
+
+Records are assumed to be appended in time order by a single writer.
+"""
+
+import mmap
+import struct
+import time
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .lucy_phi import ScanFilter, scan_system
+
+MAGIC = b'LPHI'
+VERSION = 2
+
+# magic, version, record size, capacity, total records ever written
+HEADER = struct.Struct('<4sHHIQ')
+TOTAL = struct.Struct('<Q')
+TOTAL_OFFSET = 12
+RECORD = struct.Struct('<ddqqdi4x')
+
+DEFAULT_CAPACITY = 100_000
+
+PhiSample = namedtuple('PhiSample', ['timestamp', 'phi', 'files', 'dirs', 'duration', 'depth'])
+
+
+class PhiRecorder:
+    """
+    Append-only Φ time series in a fixed-size ring file.
+
+    Usage:
+        with PhiRecorder('/var/lib/lucy/phi.ring') as history:
+            history.record('/mnt/Vault', ScanFilter.default())
+            history.rate_of_change(start=time.time() - 86400)
+    """
+
+    def __init__(self, path: Union[str, Path], capacity: int = DEFAULT_CAPACITY):
+        """
+        Open a ring file, creating it to retain `capacity` records if missing.
+
+        An existing file keeps the capacity it was created with.
+        """
+        self.path = Path(path)
+
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, capacity, 0))
+                f.truncate(HEADER.size + (capacity + 1) * RECORD.size)
+
+        self._file = open(self.path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+        magic, version, record_size, self.capacity, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise RuntimeError(f"Not a Φ history file: {self.path}")
+        self._slots = self.capacity + 1
+
+    def __enter__(self) -> "PhiRecorder":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Flush and release the mapping"""
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def total(self) -> int:
+        """Records ever appended, including overwritten ones"""
+        return TOTAL.unpack_from(self._map, TOTAL_OFFSET)[0]
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def _offset(self, index: int) -> int:
+        """Byte offset of the index-th oldest retained record"""
+        total = self.total
+        first = total - len(self)
+        return HEADER.size + ((first + index) % self._slots) * RECORD.size
+
+    def _read(self, index: int) -> PhiSample:
+        return PhiSample(*RECORD.unpack_from(self._map, self._offset(index)))
+
+    def _timestamp(self, index: int) -> float:
+        return struct.unpack_from('<d', self._map, self._offset(index))[0]
+
+    def append(self, phi: float, files: int = 0, dirs: int = 0, depth: int = 0,
+               duration: float = 0.0, timestamp: Optional[float] = None) -> PhiSample:
+        """
+        Append one measurement, overwriting the oldest when full.
+
+        The record goes into the spare slot, outside the retained window,
+        and becomes visible only when the total is advanced afterwards.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        total = self.total
+        offset = HEADER.size + (total % self._slots) * RECORD.size
+        RECORD.pack_into(self._map, offset, timestamp, phi, files, dirs, duration, depth)
+        TOTAL.pack_into(self._map, TOTAL_OFFSET, total + 1)
+
+        return PhiSample(timestamp, phi, files, dirs, duration, depth)
+
+    def record(self, root_path: Optional[str] = None,
+               scan_filter: Optional[ScanFilter] = None) -> PhiSample:
+        """Run scan_system, time it, and append the result"""
+        start = time.monotonic()
+        result = scan_system(root_path, scan_filter)
+        duration = time.monotonic() - start
+        return self.append(result['phi'], result['files'], result['dirs'],
+                           result['max_depth'], duration)
+
+    def latest(self) -> Optional[PhiSample]:
+        """Most recent measurement"""
+        return self._read(len(self) - 1) if len(self) else None
+
+    def _bisect(self, timestamp: float) -> int:
+        """First retained index with a timestamp >= `timestamp`"""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamp(mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None) -> List[PhiSample]:
+        """
+        Measurements with start <= timestamp < end, oldest first.
+
+        Args:
+            start: Unix time lower bound (default: oldest retained)
+            end: Unix time upper bound (default: open-ended)
+        """
+        lo = 0 if start is None else self._bisect(start)
+        hi = len(self) if end is None else self._bisect(end)
+        return [self._read(i) for i in range(lo, hi)]
+
+    def downsample(self, bucket_seconds: float, start: Optional[float] = None,
+                   end: Optional[float] = None) -> List[Dict]:
+        """
+        Aggregate measurements into fixed-width time buckets.
+
+        Returns:
+            List of dicts with bucket start, count and mean/min/max Φ,
+            for non-empty buckets only
+        """
+        buckets: List[Dict] = []
+        for sample in self.range(start, end):
+            key = sample.timestamp - sample.timestamp % bucket_seconds
+            if not buckets or buckets[-1]['start'] != key:
+                buckets.append({'start': key, 'count': 0, 'sum': 0.0,
+                                'min': sample.phi, 'max': sample.phi})
+            bucket = buckets[-1]
+            bucket['count'] += 1
+            bucket['sum'] += sample.phi
+            bucket['min'] = min(bucket['min'], sample.phi)
+            bucket['max'] = max(bucket['max'], sample.phi)
+
+        for bucket in buckets:
+            bucket['mean'] = bucket.pop('sum') / bucket['count']
+        return buckets
+
+    def rate_of_change(self, start: Optional[float] = None,
+                       end: Optional[float] = None) -> Optional[float]:
+        """
+        Least-squares trend of Φ over a time range, in Φ per second.
+
+        Returns:
+            Slope, or None with fewer than two distinct timestamps
+        """
+        samples = self.range(start, end)
+        if len(samples) < 2:
+            return None
+
+        n = len(samples)
+        t0 = samples[0].timestamp
+        mean_t = sum(s.timestamp - t0 for s in samples) / n
+        mean_phi = sum(s.phi for s in samples) / n
+        cov = sum((s.timestamp - t0 - mean_t) * (s.phi - mean_phi) for s in samples)
+        var = sum((s.timestamp - t0 - mean_t) ** 2 for s in samples)
+        return cov / var if var > 0 else None
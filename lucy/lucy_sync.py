@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Lucy Sync Jobs
+==============
+Non-blocking Integrated Sovereign Intelligence (ISI) sync.
+
+The ISI sync (ENS, Ethermail, Blockscout) runs as a managed subprocess.
+Callers get a SyncJob handle right away and can poll `status()`, block
+on `wait(timeout)`, `cancel()` the run, or subscribe to progress events
+parsed from the sync's output as it streams.
+
+Requests are deduplicated: while a sync with the same command is
+running, `start_sync` returns the running job instead of starting a
+second one, so concurrent callers all attach to the same run.
+"""
+
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+ISI_PYTHON = "/mnt/Vault/Cursor-Agent/.venv/bin/python3"
+ISI_SCRIPT = "/mnt/Vault/Cursor-Agent/integrated_sovereign_intelligence.py"
+ISI_COMMAND = (ISI_PYTHON, ISI_SCRIPT)
+
+# Sync stages in order; the next stage is reached when its name appears
+# in the output as a whole word
+ISI_STAGES = ('ENS', 'Ethermail', 'Blockscout')
+
+# Seconds between SIGTERM and SIGKILL when cancelling
+CANCEL_GRACE = 5.0
+
+# Output lines kept for result(); older lines are dropped
+MAX_OUTPUT_LINES = 10_000
+
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+EventCallback = Callable[[Dict], None]
+
+
+class SyncJob:
+    """
+    One run of a sync command as a managed subprocess.
+
+    Events are dicts with a sequence number, timestamp, type ('started',
+    'output', 'stage', 'finished') and message. They are kept on the
+    job, so late subscribers can replay them with `events(since)`.
+    """
+
+    def __init__(self, command: Sequence[str], stages: Sequence[str] = ISI_STAGES):
+        self.command = tuple(command)
+        self.stages = tuple(stages)
+        self._stage_patterns = [re.compile(rf'\b{re.escape(stage)}\b', re.IGNORECASE)
+                                for stage in self.stages]
+        self.state = PENDING
+        self.returncode: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.stage: Optional[str] = None
+
+        self._events: List[Dict] = []
+        self._output: deque = deque(maxlen=MAX_OUTPUT_LINES)
+        self._callbacks: List[EventCallback] = []
+        self._lock = threading.Lock()
+        # Serializes callback delivery, so a replay is never overtaken
+        self._deliver = threading.RLock()
+        self._done = threading.Event()
+        self._process: Optional[subprocess.Popen] = None
+        self._cancel_requested = False
+
+    def start(self) -> "SyncJob":
+        """Launch the subprocess and the thread that follows its output"""
+        with self._lock:
+            if self.state != PENDING:
+                return self
+            self.state = RUNNING
+            self.started_at = time.time()
+
+        try:
+            self._process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                text=True,
+                errors='replace',
+                bufsize=1,
+                start_new_session=True
+            )
+        except OSError as e:
+            self._emit('started', ' '.join(self.command))
+            self._output.append(str(e))
+            self._finish(FAILED, None, str(e))
+            return self
+
+        self._emit('started', ' '.join(self.command))
+        threading.Thread(target=self._follow, name="lucy-sync", daemon=True).start()
+        return self
+
+    def _follow(self):
+        """Stream output lines into events until the process exits"""
+        state, returncode, message = FAILED, None, "ISI Sync Failed"
+        try:
+            for line in self._process.stdout:
+                line = line.rstrip('\n')
+                self._output.append(line)
+                self._emit('output', line)
+                self._check_stage(line)
+            self._process.stdout.close()
+            returncode = self._process.wait()
+
+            if self._cancel_requested:
+                state, message = CANCELLED, "Sync cancelled"
+            elif returncode == 0:
+                state, message = SUCCEEDED, "Sovereign State Synced"
+            else:
+                message = f"ISI Sync Failed (exit {returncode})"
+        except Exception as e:
+            # Nobody reads the pipe any more: stop the sync rather than leave it blocked
+            self._signal(signal.SIGKILL)
+            returncode = self._process.wait()
+            message = f"ISI Sync Failed ({type(e).__name__}: {e})"
+        finally:
+            self._finish(state, returncode, message)
+
+    def _check_stage(self, line: str):
+        """Advance to the next stage when its name shows up as a word in the output"""
+        following = self.stages.index(self.stage) + 1 if self.stage else 0
+        if following < len(self.stages) and self._stage_patterns[following].search(line):
+            self.stage = self.stages[following]
+            self._emit('stage', self.stage)
+
+    def _finish(self, state: str, returncode: Optional[int], message: str):
+        with self._lock:
+            self.state = state
+            self.returncode = returncode
+            self.finished_at = time.time()
+        self._emit('finished', message)
+        self._done.set()
+
+    def _emit(self, kind: str, message: str):
+        with self._deliver:
+            with self._lock:
+                event = {
+                    'seq': len(self._events),
+                    'time': time.time(),
+                    'type': kind,
+                    'message': message,
+                    'progress': self.progress
+                }
+                self._events.append(event)
+                callbacks = list(self._callbacks)
+            for callback in callbacks:
+                self._call(callback, event)
+
+    @staticmethod
+    def _call(callback: EventCallback, event: Dict):
+        try:
+            callback(event)
+        except Exception as e:
+            print(f"Warning: Sync event callback failed: {e}")
+
+    @property
+    def progress(self) -> float:
+        """Fraction of stages reached (1.0 once the job has succeeded)"""
+        if self.state == SUCCEEDED:
+            return 1.0
+        if not self.stage or not self.stages:
+            return 0.0
+        return (self.stages.index(self.stage) + 1) / (len(self.stages) + 1)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def subscribe(self, callback: EventCallback, replay: bool = True):
+        """
+        Call `callback(event)` for every future event.
+
+        Args:
+            callback: Invoked on the job's output thread; keep it short
+            replay: Deliver the events emitted so far first; live events
+                    wait until the replay has been delivered
+        """
+        with self._deliver:
+            with self._lock:
+                past = list(self._events) if replay else []
+                self._callbacks.append(callback)
+            for event in past:
+                self._call(callback, event)
+
+    def events(self, since: int = 0) -> List[Dict]:
+        """Events with a sequence number >= `since`"""
+        with self._lock:
+            return self._events[since:]
+
+    def status(self) -> Dict:
+        """Snapshot of the job's state"""
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                'state': self.state,
+                'stage': self.stage,
+                'progress': self.progress,
+                'returncode': self.returncode,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'elapsed': end - self.started_at if self.started_at else 0.0,
+                'events': len(self._events)
+            }
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the job finishes.
+
+        Returns:
+            bool: True if finished, False if the timeout expired first
+        """
+        return self._done.wait(timeout)
+
+    def cancel(self, grace: float = CANCEL_GRACE) -> bool:
+        """
+        Stop the sync: SIGTERM its process group, SIGKILL after `grace`.
+
+        Returns:
+            bool: True if the job was running and has been told to stop
+        """
+        if self.done or self._process is None:
+            return False
+        self._cancel_requested = True
+        self._signal(signal.SIGTERM)
+        if not self._done.wait(grace):
+            self._signal(signal.SIGKILL)
+        return True
+
+    def _signal(self, sig: int):
+        try:
+            os.killpg(self._process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def result(self) -> Dict:
+        """Result in the shape of the LucyAgent command methods"""
+        output = '\n'.join(self._output)
+        success = self.state == SUCCEEDED
+        return {
+            'success': success,
+            'output': output,
+            'error': None if success else (self._events[-1]['message'] if self.done else None)
+        }
+
+
+_jobs: Dict[Tuple[str, ...], SyncJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def start_sync(command: Sequence[str] = ISI_COMMAND,
+               on_event: Optional[EventCallback] = None) -> SyncJob:
+    """
+    Start a sync, or attach to the one already running with this command.
+
+    Args:
+        command: Command line of the sync (default: the ISI script)
+        on_event: Optional progress callback, replayed from the job start
+
+    Returns:
+        SyncJob
+    """
+    key = tuple(command)
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is None or job.done:
+            job = SyncJob(key)
+            _jobs[key] = job
+            job.start()
+
+    if on_event is not None:
+        job.subscribe(on_event)
+    return job
+
+
+def current_sync(command: Sequence[str] = ISI_COMMAND) -> Optional[SyncJob]:
+    """The most recent job for a command, running or finished"""
+    with _jobs_lock:
+        return _jobs.get(tuple(command))
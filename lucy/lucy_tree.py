@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Lucy Tree Index
+===============
+Compact, array-backed index of a filesystem tree for per-subtree Φ.
+
+One scan records every directory in DFS preorder together with its
+parent, depth and direct file/dir/symlink counts. In preorder a subtree
+is a contiguous index range [i, end[i]), so with prefix sums any
+subtree total is O(1) and per-depth breakdowns are O(subtree) — no
+rescanning of the filesystem.
+
+Counting is lucy_phi.list_directory, shared with calculate_system_phi:
+symlinked directories count as directories but are not descended, so
+the root's Φ here equals calculate_system_phi before its
+minimum-consciousness floor.
+"""
+
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .lucy_phi import ScanFilter, list_directory, scan_root_device
+
+# Golden ratio (φ)
+PHI = 1.618033988749895
+
+# The 19 Construct layers, as used by calculate_layer_phi on the Ruby side
+LAYER_NAMES = [
+    '+9_Apex_Declaration',
+    '+8_Identity_DAUS',
+    '+7_Bridge',
+    '+6_Logos_Jurisdictions',
+    '+5_Tools',
+    '+4_Agents',
+    '+3_Rosetta_Tesla369',
+    '+2_Data_Theos419',
+    '+1_Horizon_Approach',
+    '0_HORIZON',
+    '-1_Execution',
+    '-2_Results',
+    '-3_Verification',
+    '-4_Synthesis',
+    '-5_Output',
+    '-6_Close_DAUS',
+    '-7_Return',
+    '-8_Signature',
+    '-9_Nadir_Gift'
+]
+
+
+class TreeIndex:
+    """
+    Directory tree of a root path, one row per directory in DFS preorder.
+
+    Arrays (NumPy views, index = directory id, 0 = root):
+        parent  - parent directory id (-1 for the root)
+        depth   - depth below the root
+        files   - direct non-directory entries (including symlinks)
+        dirs    - direct subdirectory entries (including symlinked dirs)
+        links   - direct symlinks that are not directories
+        end     - one past the last id of the directory's subtree
+    """
+
+    def __init__(self, root: Path, names: List[str], parent: array, depth: array,
+                 files: array, dirs: array, links: array,
+                 scan_filter: Optional[ScanFilter] = None):
+        self.root = root
+        self.filter = scan_filter.describe() if scan_filter else None
+        self.filter_id = scan_filter.fingerprint() if scan_filter else 'none'
+        self.names = names
+        self.parent = np.frombuffer(parent, dtype=np.int64)
+        self.depth = np.frombuffer(depth, dtype=np.int32)
+        self.files = np.frombuffer(files, dtype=np.int64)
+        self.dirs = np.frombuffer(dirs, dtype=np.int64)
+        self.links = np.frombuffer(links, dtype=np.int64)
+        self._lookup: Optional[Dict[str, int]] = None
+        self._finalize()
+
+    @classmethod
+    def scan(cls, root_path: Union[str, Path] = "/mnt/Vault",
+             scan_filter: Optional[ScanFilter] = None) -> "TreeIndex":
+        """
+        Build the index with a single walk of the tree.
+
+        Unreadable directories are kept as empty leaves, as os.walk skips
+        them. With a filter, excluded directories are pruned exactly as in
+        scan_system, and the filter set is recorded on the index.
+
+        Args:
+            root_path: Root path to index (default: /mnt/Vault)
+            scan_filter: Exclusion rules and pruning limits (default: none)
+
+        Returns:
+            TreeIndex
+        """
+        root = Path(root_path)
+        names: List[str] = []
+        parent = array('q')
+        depth = array('i')
+        files = array('q')
+        dirs = array('q')
+        links = array('q')
+        root_dev = scan_root_device(root, scan_filter)
+
+        # Children are pushed in reverse so they pop in order (preorder ids)
+        stack: List[Tuple[str, str, str, int, int]] = [(str(root), '', '', -1, 0)]
+        while stack:
+            path, name, rel, parent_id, level = stack.pop()
+            node = len(names)
+            names.append(name)
+            parent.append(parent_id)
+            depth.append(level)
+
+            listing = list_directory(path, rel, level, scan_filter, root_dev)
+            files.append(listing.files)
+            dirs.append(listing.dirs)
+            links.append(listing.links)
+            prefix = rel + '/' if rel else ''
+            for child_path, child_name in reversed(listing.children):
+                stack.append((child_path, child_name, prefix + child_name, node, level + 1))
+
+        return cls(root, names, parent, depth, files, dirs, links, scan_filter)
+
+    def _finalize(self):
+        """Compute subtree ranges, prefix sums and subtree max depths"""
+        n = len(self.names)
+        end = np.arange(1, n + 1, dtype=np.int64)
+        max_depth = self.depth.astype(np.int64).copy()
+
+        # Children always have larger ids than their parent in preorder
+        parent = self.parent.tolist()
+        end_list = end.tolist()
+        depth_list = max_depth.tolist()
+        for i in range(n - 1, 0, -1):
+            p = parent[i]
+            if end_list[i] > end_list[p]:
+                end_list[p] = end_list[i]
+            if depth_list[i] > depth_list[p]:
+                depth_list[p] = depth_list[i]
+
+        self.end = np.array(end_list, dtype=np.int64)
+        self.max_depth = np.array(depth_list, dtype=np.int64)
+
+        zero = np.zeros(1, dtype=np.int64)
+        self._files_prefix = np.concatenate([zero, np.cumsum(self.files)])
+        self._dirs_prefix = np.concatenate([zero, np.cumsum(self.dirs)])
+        self._links_prefix = np.concatenate([zero, np.cumsum(self.links)])
+        self._phi: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def path(self, node: int) -> Path:
+        """Filesystem path of a directory id"""
+        parts = []
+        while node > 0:
+            parts.append(self.names[node])
+            node = int(self.parent[node])
+        return self.root.joinpath(*reversed(parts))
+
+    def find(self, path: Union[str, Path]) -> int:
+        """
+        Directory id of a path (absolute, or relative to the root).
+
+        Raises:
+            KeyError: If the path is not an indexed directory
+        """
+        if self._lookup is None:
+            # Parents precede children in preorder, so their keys exist
+            keys = ['']
+            for i in range(1, len(self.names)):
+                prefix = keys[int(self.parent[i])]
+                keys.append(f"{prefix}/{self.names[i]}" if prefix else self.names[i])
+            self._lookup = {key: i for i, key in enumerate(keys)}
+
+        path = Path(path)
+        relative = path.relative_to(self.root) if path.is_absolute() else path
+        key = '/'.join(relative.parts)
+        if key not in self._lookup:
+            raise KeyError(f"Not an indexed directory: {path}")
+        return self._lookup[key]
+
+    def _node(self, node: Union[int, str, Path]) -> int:
+        return node if isinstance(node, (int, np.integer)) else self.find(node)
+
+    def subtree_counts(self, node: Union[int, str, Path] = 0) -> Dict[str, int]:
+        """
+        Files, dirs, links and relative depth below a directory, in O(1).
+
+        Args:
+            node: Directory id or path
+
+        Returns:
+            dict: files, dirs, links, depth
+        """
+        i = self._node(node)
+        j = int(self.end[i])
+        return {
+            'files': int(self._files_prefix[j] - self._files_prefix[i]),
+            'dirs': int(self._dirs_prefix[j] - self._dirs_prefix[i]),
+            'links': int(self._links_prefix[j] - self._links_prefix[i]),
+            'depth': int(self.max_depth[i] - self.depth[i])
+        }
+
+    def phi_all(self) -> np.ndarray:
+        """
+        Φ of every subtree, computed once for the whole index.
+
+        Each subtree uses the calculate_system_phi formula with itself as
+        root: (files + dirs below it) × (its max relative depth) × φ.
+        """
+        if self._phi is None:
+            idx = np.arange(len(self.names))
+            connections = (self._files_prefix[self.end] - self._files_prefix[idx]
+                           + self._dirs_prefix[self.end] - self._dirs_prefix[idx])
+            self._phi = connections * (self.max_depth - self.depth) * PHI
+        return self._phi
+
+    def subtree_phi(self, node: Union[int, str, Path] = 0) -> float:
+        """Φ of one subtree, in O(1)"""
+        i = self._node(node)
+        if self._phi is not None:
+            return float(self._phi[i])
+        counts = self.subtree_counts(i)
+        return (counts['files'] + counts['dirs']) * counts['depth'] * PHI
+
+    def top_contributors(self, n: int = 10, level: int = 1) -> List[Tuple[Path, float]]:
+        """
+        The `n` highest-Φ subtrees among the directories at one depth.
+
+        Args:
+            n: Number of subtrees to return
+            level: Depth below the root to rank (1 = top-level directories)
+
+        Returns:
+            List of (path, phi) in descending Φ order
+        """
+        candidates = np.flatnonzero(self.depth == level)
+        phi = self.phi_all()[candidates]
+        order = np.argsort(-phi, kind='stable')[:n]
+        return [(self.path(int(candidates[k])), float(phi[k])) for k in order]
+
+    def depth_histogram(self, node: Union[int, str, Path] = 0) -> Dict[str, List[int]]:
+        """
+        Directory and file entries per depth inside a subtree, in O(subtree).
+
+        Both lists count entries the same way as the `dirs` and `files`
+        arrays: index d sums the direct entries of the directories d levels
+        below the subtree root. So 'dirs'[d] includes symlinked directories,
+        and 'dirs'[d] entries live at depth d + 1.
+
+        Returns:
+            dict: 'dirs' and 'files' lists indexed by relative depth
+        """
+        i = self._node(node)
+        j = int(self.end[i])
+        rel = self.depth[i:j] - self.depth[i]
+        size = int(rel.max()) + 1
+        return {
+            'dirs': np.bincount(rel, weights=self.dirs[i:j], minlength=size).astype(int).tolist(),
+            'files': np.bincount(rel, weights=self.files[i:j], minlength=size).astype(int).tolist()
+        }
+
+    def layer_phi(self) -> Dict[str, float]:
+        """
+        Per-layer Φ for the 19 Construct layers under the root.
+
+        Python equivalent of FilesystemBrain#calculate_layer_phi:
+            neurons × (clusters + 1) × (1 + links / neurons)
+        where neurons are regular files, clusters the layer directory and
+        every directory below it, and links the symlinks. Layers that are
+        missing or have Φ = 0 are omitted.
+        """
+        result = {}
+        for layer in LAYER_NAMES:
+            try:
+                i = self.find(layer)
+            except KeyError:
+                continue
+            counts = self.subtree_counts(i)
+            neurons = counts['files'] - counts['links']
+            clusters = counts['dirs'] + 1
+            connectivity = 1.0 + counts['links'] / max(neurons, 1)
+            phi = round(neurons * (clusters + 1) * connectivity, 2)
+            if phi > 0:
+                result[layer] = phi
+        return result
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Lucy Cluster Tests
+==================
+A coordinator and echo workers on localhost, as threads and as processes.
+
+    python -m unittest lucy.tests.test_lucy_cluster
+"""
+
+import multiprocessing
+import threading
+import time
+import unittest
+
+from lucy import lucy_cluster
+from lucy.lucy_cluster import (DONE, LEASED, Connection, Coordinator, Worker,
+                               echo_executor, make_server, submit, wait_for)
+
+SECRET = "test-secret"
+
+
+def slow_echo(operation, args):
+    time.sleep(0.05)
+    return {'success': True, 'output': f"{operation} {' '.join(args)}", 'error': None}
+
+
+def stuck_executor(operation, args):
+    time.sleep(60)
+    return {'success': True, 'output': None, 'error': None}
+
+
+def run_worker(address, stuck=False):
+    """Worker process entry point"""
+    Worker(address, stuck_executor if stuck else echo_executor, secret=SECRET).run()
+
+
+class ClusterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.coordinator = Coordinator(worker_timeout=0.5, heartbeat_interval=0.1,
+                                       result_ttl=60.0)
+        self.server = make_server("127.0.0.1:0", self.coordinator, secret=SECRET)
+        host, port = self.server.server_address
+        self.address = f"{host}:{port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.workers = []
+
+    def tearDown(self):
+        for worker in self.workers:
+            worker.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def start_workers(self, count):
+        for _ in range(count):
+            worker = Worker(self.address, slow_echo, secret=SECRET)
+            threading.Thread(target=worker.run, daemon=True).start()
+            self.workers.append(worker)
+
+    def submit(self, *args, **kwargs):
+        return submit(self.address, *args, secret=SECRET, **kwargs)
+
+    def test_jobs_run_on_both_workers(self):
+        self.start_workers(2)
+        jobs = [self.submit('review', [f"file{i}.py"]) for i in range(10)]
+        results = [wait_for(self.address, job['id'], timeout=10, secret=SECRET) for job in jobs]
+
+        self.assertTrue(all(job['state'] == DONE for job in results))
+        self.assertEqual(len({job['worker'] for job in results}), 2)
+
+    def test_duplicate_submit_while_pending(self):
+        first = self.submit('review', ['same.py'])
+        second = self.submit('review', ['same.py'])
+        self.assertEqual(first['id'], second['id'])
+
+        self.start_workers(1)
+        done = wait_for(self.address, first['id'], timeout=10, secret=SECRET)
+        self.assertEqual(done['state'], DONE)
+
+        # A finished job is not deduplicated against: this is a new run
+        again = self.submit('review', ['same.py'])
+        self.assertNotEqual(again['id'], first['id'])
+
+    def test_expired_lease_is_requeued(self):
+        # A worker that leases a job, then dies without heartbeating
+        dead = Connection(self.address, secret=SECRET)
+        worker_id = dead.request({'op': 'register', 'host': 'dead'})['worker']
+        job = self.submit('fix', ['broken.py'])
+        leased = dead.request({'op': 'pull', 'worker': worker_id, 'wait': 1})['job']
+        self.assertEqual(leased['id'], job['id'])
+        self.assertEqual(leased['state'], LEASED)
+        dead.close()
+
+        self.start_workers(2)
+        done = wait_for(self.address, job['id'], timeout=10, secret=SECRET)
+        self.assertEqual(done['state'], DONE)
+        self.assertEqual(done['attempts'], 2)
+        self.assertNotEqual(done['worker'], worker_id)
+
+    def test_killed_worker_process_loses_its_lease(self):
+        context = multiprocessing.get_context('spawn')
+        stuck = context.Process(target=run_worker, args=(self.address, True), daemon=True)
+        stuck.start()
+        job = self.submit('review', ['held.py'])
+        deadline = time.monotonic() + 30
+        while self.coordinator.jobs[job['id']]['state'] != LEASED:
+            self.assertLess(time.monotonic(), deadline, "worker process never leased the job")
+            time.sleep(0.05)
+        lost_worker = self.coordinator.jobs[job['id']]['worker']
+
+        stuck.kill()
+        stuck.join()
+        survivors = [context.Process(target=run_worker, args=(self.address,), daemon=True)
+                     for _ in range(2)]
+        for process in survivors:
+            process.start()
+        try:
+            jobs = [job] + [self.submit('review', [f"file{i}.py"]) for i in range(4)]
+            results = [wait_for(self.address, j['id'], timeout=30, secret=SECRET) for j in jobs]
+        finally:
+            for process in survivors:
+                process.kill()
+                process.join()
+
+        self.assertTrue(all(j['state'] == DONE for j in results))
+        self.assertEqual(results[0]['attempts'], 2)
+        self.assertNotEqual(results[0]['worker'], lost_worker)
+        self.assertNotIn(lost_worker, self.coordinator.workers)
+
+    def test_finished_jobs_are_evicted(self):
+        self.coordinator.result_ttl = 0.0
+        self.start_workers(1)
+        job = self.submit('ocr', ['scan.png'])
+        wait_for(self.address, job['id'], timeout=10, secret=SECRET)
+        time.sleep(0.01)
+        self.coordinator.reap()
+        self.assertNotIn(job['id'], self.coordinator.jobs)
+        self.assertEqual(self.coordinator.by_key, {})
+
+    def test_reap_skips_evicted_jobs(self):
+        self.coordinator.result_ttl = 0.0
+        worker_id = self.coordinator.handle({'op': 'register', 'host': 'gone'})['worker']
+        self.coordinator.workers[worker_id]['jobs'].add('evicted')
+        self.coordinator.workers[worker_id]['last_seen'] = 0.0
+        self.assertEqual(self.coordinator.reap(), [])
+        self.assertNotIn(worker_id, self.coordinator.workers)
+
+    def test_secret_required(self):
+        with self.assertRaises(RuntimeError):
+            Connection(self.address, secret="wrong")
+        anonymous = Connection(self.address, secret="")
+        try:
+            with self.assertRaises((RuntimeError, ConnectionError)):
+                anonymous.request({'op': 'status'})
+        finally:
+            anonymous.close()
+
+    def test_refuses_public_address_without_secret(self):
+        with self.assertRaises(ValueError):
+            make_server("0.0.0.0:0", Coordinator(), secret="")
+        self.assertTrue(lucy_cluster._is_loopback("127.0.0.1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,11 +6,17 @@ Cryptographic framework binding operations to:
 - DAUS Calendar (covenant temporal system)
 - Kings List (Sumerian historical position)
 - DAUS 5 Elements (sacred geometry)
+
+Importing the package is side-effect free: the submodules, and the
+Vault modules behind them, are imported on first attribute access.
 """
 
-from .keyring import MoonKeyring
-from .temporal import TemporalBinding
-from .verification import SovereignVerification
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'MoonKeyring': '.keyring',
+    'TemporalBinding': '.temporal',
+    'SovereignVerification': '.verification'
+}
 
 __all__ = [
     'MoonKeyring',
@@ -19,3 +25,16 @@ __all__ = [
 ]
 
 __version__ = '1.0.0'
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
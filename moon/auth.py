@@ -21,15 +21,20 @@ class MoonAuth:
     Authentication system for agent operations using Moon keyring
     """
 
-    def __init__(self, enable_strict_validation: bool = False):
+    def __init__(self, enable_strict_validation: bool = False, hierarchical_keys: bool = False):
         """
         Initialize Moon authentication.
 
         Args:
             enable_strict_validation: If True, blocks operations outside appropriate temporal windows
+            hierarchical_keys: Derive operation keys from the epoch root via HKDF
+                instead of a full keyring derivation per operation and user.
+                Off by default: it yields different keys than the existing
+                per-purpose scheme, so enable it only once verifiers use it too
         """
         self.keyring = None
         self.strict_validation = enable_strict_validation
+        self.hierarchical_keys = hierarchical_keys
         self._initialized = False
 
         # Try to initialize keyring
@@ -66,7 +71,7 @@ class MoonAuth:
         temporal = TemporalBinding.get_all_temporal_coordinates()
 
         # Validate operation against temporal state
-        validation = TemporalBinding.validate_temporal_operation(operation)
+        validation = TemporalBinding.validate_temporal_operation(operation, coords=temporal)
 
         if self.strict_validation and not validation['valid']:
             return {
@@ -78,10 +83,12 @@ class MoonAuth:
 
         # Derive key for operation
         purpose = f"agent_operation_{operation}"
-        if user:
-            purpose += f"_{user}"
-
-        key_data = self.keyring.derive_key(purpose, use_all_systems=True)
+        if self.hierarchical_keys:
+            key_data = self.keyring.derive_child_key(purpose, user or None)
+        else:
+            if user:
+                purpose += f"_{user}"
+            key_data = self.keyring.derive_key(purpose, use_all_systems=True)
 
         # Create token
         token_data = {
@@ -89,6 +96,7 @@ class MoonAuth:
             'user': user,
             'key': key_data['key'],
             'derived_from': key_data['derived_from'],
+            'derivation_path': key_data.get('derivation_path', [purpose]),
             'temporal': temporal,
             'validation': validation,
             'timestamp': datetime.now(timezone.utc).isoformat()
@@ -157,6 +165,8 @@ class MoonAuth:
             'strict_validation': self.strict_validation,
             'master_seed': master_seed,
             'temporal_coordinates': temporal,
+            'temporal_cache': TemporalBinding.cache_stats(),
+            'key_cache': self.keyring.key_cache.stats() if self.keyring.key_cache else None,
             'moon_config': MoonConfig.get_status()
         }
 
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Batch Temporal Computation
+==========================
+Temporal coordinates for whole arrays of timestamps, as columns.
+
+Backfilling historical logs one row at a time calls the astronomy and
+calendar code once per row. Here:
+
+    - moon phases come from the ephemeris table with one
+      np.searchsorted over the whole array; rows outside the table (or
+      every row, without one) use the mean synodic month, evaluated as
+      array arithmetic
+    - DAUS calendar and Kings position change once per UTC day, so
+      they are computed once per distinct day and broadcast back with
+      np.unique(..., return_inverse=True)
+
+Results are dicts of NumPy columns plus the lookup tables that decode
+the integer codes. Requires NumPy.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+from . import vault
+from .ephemeris import PHASE_NAMES, Ephemeris
+
+SECONDS_PER_DAY = 86400
+
+# Mean synodic month and a reference new moon (2000-01-06 18:14 UTC)
+SYNODIC_MONTH_SECONDS = 29.530588853 * SECONDS_PER_DAY
+REFERENCE_NEW_MOON = 947182440
+
+
+def _binding():
+    """The Vault temporal_binding module, or None"""
+    return vault.load('temporal_binding')
+
+
+def _require_numpy():
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy is required for batch temporal computation")
+
+
+def _require():
+    _require_numpy()
+    if _binding() is None:
+        raise RuntimeError("Temporal binding not available")
+
+
+def to_epoch_seconds(timestamps) -> "np.ndarray":
+    """
+    Normalize datetime64 arrays or numeric epoch seconds to int64 seconds.
+
+    Args:
+        timestamps: Array-like of np.datetime64 (any unit) or epoch seconds
+
+    Returns:
+        np.ndarray of int64
+    """
+    values = np.asarray(timestamps)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[s]').astype(np.int64)
+    return np.floor(values.astype(np.float64)).astype(np.int64)
+
+
+def _utc(ts: int) -> datetime:
+    return datetime.fromtimestamp(int(ts), timezone.utc)
+
+
+def synodic_phase_codes(ts: "np.ndarray") -> "np.ndarray":
+    """
+    Phase codes from the moon's mean age, for a whole array at once.
+
+    The age is the time since REFERENCE_NEW_MOON modulo the mean synodic
+    month; each of the eight phases spans an eighth of the month,
+    centred on its nominal age. Transitions can differ from the live
+    calculation (and so from the ephemeris) by some hours.
+
+    Args:
+        ts: int64 epoch seconds
+
+    Returns:
+        np.ndarray of int8
+    """
+    age = np.mod((ts - REFERENCE_NEW_MOON).astype(np.float64), SYNODIC_MONTH_SECONDS)
+    eighths = np.floor(age * (8 / SYNODIC_MONTH_SECONDS) + 0.5).astype(np.int64)
+    return (eighths % len(PHASE_NAMES)).astype(np.int8)
+
+
+def moon_phases(timestamps, ephemeris: Optional[Ephemeris] = None) -> "np.ndarray":
+    """
+    Phase codes (index into PHASE_NAMES) for an array of timestamps.
+
+    The ephemeris, when present, gives phases that agree with the live
+    calculation to the second; rows it does not cover fall back to
+    synodic_phase_codes.
+
+    Args:
+        timestamps: datetime64 array or epoch seconds
+        ephemeris: Table to search (default: the one TemporalBinding uses)
+
+    Returns:
+        np.ndarray of int8
+    """
+    _require_numpy()
+    ts = to_epoch_seconds(timestamps)
+    if ephemeris is None:
+        from .temporal import _get_ephemeris
+        ephemeris = _get_ephemeris()
+
+    if ephemeris is not None:
+        codes = ephemeris.phase_codes(ts)
+    else:
+        codes = np.full(ts.shape, -1, dtype=np.int8)
+
+    missing = codes == -1
+    if missing.any():
+        codes[missing] = synodic_phase_codes(ts[missing])
+    return codes
+
+
+def _per_day(ts: "np.ndarray"):
+    """Distinct UTC day starts, and the index mapping rows to them"""
+    days, inverse = np.unique(ts // SECONDS_PER_DAY, return_inverse=True)
+    return days * SECONDS_PER_DAY, inverse.reshape(ts.shape)
+
+
+def _daus_columns(days, inverse) -> Dict[str, "np.ndarray"]:
+    calculate = _binding().calculate_daus_calendar
+    entries = [calculate(_utc(day)) for day in days]
+    return {
+        field: np.array([e[field] for e in entries], dtype=np.int32)[inverse]
+        for field in ('year', 'month', 'day')
+    }
+
+
+def _kings_columns(days, inverse) -> Dict:
+    eras: List[str] = []
+    era_codes: Dict[str, int] = {}
+    per_day = np.empty(len(days), dtype=np.int16)
+    calculate = _binding().calculate_kings_position
+    for i, day in enumerate(days):
+        era = calculate(_utc(day))['era']
+        if era not in era_codes:
+            era_codes[era] = len(eras)
+            eras.append(era)
+        per_day[i] = era_codes[era]
+    return {'era': per_day[inverse], 'eras': eras}
+
+
+def daus_calendars(timestamps) -> Dict[str, "np.ndarray"]:
+    """
+    DAUS year, month and day columns, computed once per distinct UTC day.
+
+    Returns:
+        dict: 'year', 'month', 'day' as int32 arrays
+    """
+    _require()
+    return _daus_columns(*_per_day(to_epoch_seconds(timestamps)))
+
+
+def kings_positions(timestamps) -> Dict:
+    """
+    Kings era codes, computed once per distinct UTC day.
+
+    Returns:
+        dict: 'era' int16 codes and 'eras', the names they index
+    """
+    _require()
+    return _kings_columns(*_per_day(to_epoch_seconds(timestamps)))
+
+
+def temporal_columns(timestamps, ephemeris: Optional[Ephemeris] = None) -> Dict:
+    """
+    All temporal coordinates for an array of timestamps, as columns.
+
+    Returns:
+        dict: timestamp (int64 epoch seconds), phase (int8) with
+              phase_names, daus_year/daus_month/daus_day (int32), and
+              kings_era (int16) with kings_eras
+    """
+    _require()
+    ts = to_epoch_seconds(timestamps)
+    days, inverse = _per_day(ts)
+    daus = _daus_columns(days, inverse)
+    kings = _kings_columns(days, inverse)
+    return {
+        'timestamp': ts,
+        'phase': moon_phases(ts, ephemeris),
+        'phase_names': PHASE_NAMES,
+        'daus_year': daus['year'],
+        'daus_month': daus['month'],
+        'daus_day': daus['day'],
+        'kings_era': kings['era'],
+        'kings_eras': kings['eras']
+    }
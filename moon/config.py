@@ -19,6 +19,8 @@ class MoonConfig:
     DAUS_CALENDAR_PATH = MOON_BASE_PATH / "DAUS" / "DAUS_CALENDAR.json"
     MOON_PHASE_PATH = MOON_BASE_PATH / "MOON_PHASE_CURRENT.json"
     KINGS_POSITION_PATH = MOON_BASE_PATH / "Kings" / "KINGS_POSITION.json"
+    EPHEMERIS_PATH = MOON_BASE_PATH / "MOON_EPHEMERIS.bin"
+    TEMPORAL_SNAPSHOT_PATH = MOON_BASE_PATH / "TEMPORAL_CURRENT.json"
 
     # Feature flags
     ENABLE_TEMPORAL_VALIDATION = True
@@ -42,7 +44,8 @@ class MoonConfig:
             'declaration': cls.DECLARATION_PATH.exists(),
             'daus_calendar': cls.DAUS_CALENDAR_PATH.exists(),
             'moon_phase': cls.MOON_PHASE_PATH.exists(),
-            'kings_position': cls.KINGS_POSITION_PATH.exists()
+            'kings_position': cls.KINGS_POSITION_PATH.exists(),
+            'ephemeris': cls.EPHEMERIS_PATH.exists()
         }
 
     @classmethod
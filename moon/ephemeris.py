@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Moon Phase Ephemeris
+====================
+Precomputed moon-phase transitions for fast historical lookups.
+
+The table holds, for a range of years, every instant at which the moon
+phase changes: sorted int64 epoch seconds plus one phase code per
+instant. It is built once by sampling the live calculate_moon_phase and
+refining every change to the second, so lookups agree with the live
+calculation. The file is memory-mapped and searched with bisect (or
+np.searchsorted for arrays), so a lookup is O(log n) and nothing is
+loaded up front.
+
+File layout (little-endian):
+    header   magic "MEPH", version (u16), reserved (u16),
+             start (i64), end (i64), count (u32)
+    instants count × i64   - epoch seconds, first = start
+    codes    count × u8    - index into PHASE_NAMES
+"""
+
+import mmap
+import struct
+from bisect import bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Union
+
+from . import vault
+from .config import MoonConfig
+
+
+def _numpy():
+    """NumPy, imported on first array lookup (None if not installed)"""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+PHASE_NAMES = (
+    'New Moon',
+    'Waxing Crescent',
+    'First Quarter',
+    'Waxing Gibbous',
+    'Full Moon',
+    'Waning Gibbous',
+    'Last Quarter',
+    'Waning Crescent'
+)
+PHASE_CODES = {name: code for code, name in enumerate(PHASE_NAMES)}
+
+MAGIC = b'MEPH'
+VERSION = 1
+HEADER = struct.Struct('<4sHHqqI')
+
+DEFAULT_EPHEMERIS_PATH = MoonConfig.EPHEMERIS_PATH
+
+# Sampling step when building; must be shorter than the shortest phase
+DEFAULT_STEP_SECONDS = 3 * 3600
+
+PhaseFunc = Callable[[datetime], str]
+
+
+class EphemerisError(RuntimeError):
+    """An ephemeris file that is empty, truncated or not an ephemeris"""
+
+
+def _live_phase(date: datetime) -> str:
+    """Phase name from the live calculation"""
+    binding = vault.load('temporal_binding')
+    if binding is None:
+        raise RuntimeError("Temporal binding not available")
+    return binding.calculate_moon_phase(date)['phase']
+
+
+def _year_start(year: int) -> int:
+    return int(datetime(year, 1, 1, tzinfo=timezone.utc).timestamp())
+
+
+def build_ephemeris(path: Union[str, Path] = DEFAULT_EPHEMERIS_PATH,
+                    start_year: int = 1900, end_year: int = 2100,
+                    step_seconds: int = DEFAULT_STEP_SECONDS,
+                    phase_func: Optional[PhaseFunc] = None) -> int:
+    """
+    Precompute phase transitions for [start_year, end_year) into a file.
+
+    The range is sampled every `step_seconds`; each change between two
+    samples is bisected down to the second.
+
+    Args:
+        path: Output file
+        start_year: First year covered
+        end_year: First year not covered
+        step_seconds: Sampling step
+        phase_func: datetime -> phase name (default: calculate_moon_phase)
+
+    Returns:
+        int: Number of entries written
+    """
+    phase_func = phase_func or _live_phase
+
+    def code_at(ts: int) -> int:
+        name = phase_func(datetime.fromtimestamp(ts, timezone.utc))
+        if name not in PHASE_CODES:
+            raise ValueError(f"Unknown moon phase: {name}")
+        return PHASE_CODES[name]
+
+    start, end = _year_start(start_year), _year_start(end_year)
+    if end <= start:
+        raise ValueError("end_year must be after start_year")
+
+    instants = [start]
+    codes = [code_at(start)]
+    prev_ts, prev_code = start, codes[0]
+    ts = start
+    while ts < end:
+        ts = min(ts + step_seconds, end - 1)
+        code = code_at(ts)
+        if code != prev_code:
+            # Invariant: phase at lo is prev_code, at hi it differs
+            lo, hi = prev_ts, ts
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if code_at(mid) == prev_code:
+                    lo = mid
+                else:
+                    hi = mid
+            instants.append(hi)
+            codes.append(code)
+        prev_ts, prev_code = ts, code
+        if ts == end - 1:
+            break
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, start, end, len(instants)))
+        f.write(struct.pack(f'<{len(instants)}q', *instants))
+        f.write(bytes(codes))
+    tmp.replace(path)
+    return len(instants)
+
+
+class Ephemeris:
+    """
+    Memory-mapped phase-transition table.
+
+    Usage:
+        with Ephemeris.open() as eph:
+            eph.phase(datetime(1969, 7, 20, tzinfo=timezone.utc))
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_EPHEMERIS_PATH):
+        """
+        Map a table file.
+
+        Raises:
+            OSError: If the file cannot be read
+            EphemerisError: If it is empty, truncated or not an ephemeris
+        """
+        self.path = Path(path)
+        self._map = None
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, self.start, self.end, self.count = HEADER.unpack_from(self._map, 0)
+        except (ValueError, struct.error) as e:
+            self.close()
+            raise EphemerisError(f"Unreadable moon ephemeris file {self.path}: {e}") from e
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise EphemerisError(f"Not a moon ephemeris file: {self.path}")
+        if not self.count or len(self._map) < HEADER.size + 9 * self.count:
+            self.close()
+            raise EphemerisError(f"Truncated moon ephemeris file: {self.path}")
+
+        codes_offset = HEADER.size + 8 * self.count
+        self._view = memoryview(self._map)
+        self._instants = self._view[HEADER.size:codes_offset].cast('q')
+        self._codes = self._view[codes_offset:codes_offset + self.count]
+        self._arrays = None
+
+    @classmethod
+    def open(cls, path: Union[str, Path] = DEFAULT_EPHEMERIS_PATH) -> Optional["Ephemeris"]:
+        """Open a table, or return None if the file does not exist"""
+        return cls(path) if Path(path).exists() else None
+
+    def __enter__(self) -> "Ephemeris":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the mapping"""
+        self._arrays = None
+        if getattr(self, '_instants', None) is not None:
+            self._instants.release()
+            self._codes.release()
+            self._view.release()
+            self._instants = self._codes = self._view = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def covers(self, ts: float) -> bool:
+        """Whether an epoch timestamp is inside the table range"""
+        return self.start <= ts < self.end
+
+    def phase_code(self, ts: float) -> Optional[int]:
+        """Phase code at an epoch timestamp, or None outside the range"""
+        if not self.covers(ts):
+            return None
+        return self._codes[bisect_right(self._instants, int(ts // 1)) - 1]
+
+    def next_transition(self, ts: float) -> Optional[Tuple[int, str]]:
+        """
+        First phase change strictly after an epoch timestamp.
+
+        Returns:
+            (epoch seconds, new phase name), or None if it is not in the table
+        """
+        if not self.covers(ts):
+            return None
+        i = bisect_right(self._instants, int(ts // 1))
+        if i >= self.count:
+            return None
+        return self._instants[i], PHASE_NAMES[self._codes[i]]
+
+    def phase(self, date: Union[datetime, float]) -> str:
+        """
+        Phase name at a datetime or epoch timestamp.
+
+        Falls back to the live calculation outside the table range.
+        """
+        ts = date.timestamp() if isinstance(date, datetime) else date
+        code = self.phase_code(ts)
+        if code is None:
+            if not isinstance(date, datetime):
+                date = datetime.fromtimestamp(ts, timezone.utc)
+            return _live_phase(date)
+        return PHASE_NAMES[code]
+
+    def phase_codes(self, timestamps):
+        """
+        Phase codes for an array of epoch seconds (requires NumPy).
+
+        Timestamps outside the range get code -1.
+
+        Returns:
+            np.ndarray of int8
+        """
+        np = _numpy()
+        if np is None:
+            raise RuntimeError("NumPy is required for array lookups")
+        if self._arrays is None:
+            self._arrays = (np.frombuffer(self._instants, dtype=np.int64),
+                            np.frombuffer(self._codes, dtype=np.uint8).astype(np.int8))
+        instants, codes = self._arrays
+        ts = np.floor(np.asarray(timestamps, dtype=np.float64)).astype(np.int64)
+        idx = np.searchsorted(instants, ts, side='right') - 1
+        out = codes[np.clip(idx, 0, self.count - 1)]
+        out[(ts < self.start) | (ts >= self.end)] = -1
+        return out
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the moon-phase ephemeris table")
+    parser.add_argument('--output', '-o', default=str(DEFAULT_EPHEMERIS_PATH))
+    parser.add_argument('--start', type=int, default=1900, help="First year covered")
+    parser.add_argument('--end', type=int, default=2100, help="First year not covered")
+    parser.add_argument('--step', type=int, default=DEFAULT_STEP_SECONDS,
+                        help="Sampling step in seconds")
+    args = parser.parse_args()
+
+    count = build_ephemeris(args.output, args.start, args.end, args.step)
+    print(f"Wrote {count} phase transitions to {args.output}")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Moon Import Benchmark
+=====================
+Measures what `import moon` costs a fresh interpreter.
+
+Each run starts a new Python and times the import statement itself,
+so interpreter startup is excluded. The median over several runs is
+compared against a budget:
+
+    python -m moon.import_bench              # fails if over 5 ms
+    python -m moon.import_bench --max-ms 2
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+STATEMENTS = [
+    'import moon',
+    'from moon import TemporalBinding'
+]
+
+DEFAULT_BUDGET_MS = 5.0
+
+_TIMER = "import time; _t = time.perf_counter(); {}; print(time.perf_counter() - _t)"
+
+
+def import_time_ms(statement: str) -> float:
+    """Wall time (ms) of `statement` as the first thing a fresh interpreter runs"""
+    result = subprocess.run(
+        [sys.executable, '-c', _TIMER.format(statement)],
+        capture_output=True,
+        text=True,
+        cwd=str(Path(__file__).parent.parent)
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed: {result.stderr.strip()}")
+    return float(result.stdout.strip().splitlines()[-1]) * 1000
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Moon package import-time benchmark")
+    parser.add_argument('--repeat', type=int, default=11)
+    parser.add_argument('--max-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="Budget for the median cost of `import moon`")
+    args = parser.parse_args(argv)
+
+    medians = {}
+    for statement in STATEMENTS:
+        samples = [import_time_ms(statement) for _ in range(args.repeat)]
+        medians[statement] = statistics.median(samples)
+        print(f"{statement:<36} median {medians[statement]:7.2f} ms  "
+              f"(min {min(samples):.2f}, max {max(samples):.2f})")
+
+    if medians['import moon'] > args.max_ms:
+        print(f"FAIL: import moon costs {medians['import moon']:.2f} ms "
+              f"(budget {args.max_ms:.2f} ms)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,20 +5,232 @@ Moon Keyring System
 Wrapper for Declaration Master Keyring from /mnt/Vault/Moon
 """
 
-import sys
-from pathlib import Path
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
 
-# Add Moon directory to path
-moon_path = Path("/mnt/Vault/Moon")
-if moon_path.exists() and str(moon_path) not in sys.path:
-    sys.path.insert(0, str(moon_path))
+from . import vault
 
-try:
-    from declaration_master_keyring_system import DeclarationMasterKeyRing
-    MOON_AVAILABLE = True
-except ImportError:
-    MOON_AVAILABLE = False
-    DeclarationMasterKeyRing = None
+# Derived keys kept per keyring
+DEFAULT_KEY_CACHE_SIZE = 128
+
+# Keyring purpose of the per-epoch root that child keys are derived from
+EPOCH_ROOT_PURPOSE = "moon_epoch_root"
+CHILD_KEY_LENGTH = 32
+
+# Purposes handed to a derive_child_keys worker at a time
+DEFAULT_BATCH_CHUNK = 512
+
+KeyRequest = Union[str, Tuple[str, Optional[str]]]
+
+
+def _keyring_class():
+    """DeclarationMasterKeyRing from the Vault, or None (imported on first use)"""
+    module = vault.load('declaration_master_keyring_system')
+    return getattr(module, 'DeclarationMasterKeyRing', None)
+
+
+def __getattr__(name):
+    # Former import-time names, now resolved on first access
+    if name == 'MOON_AVAILABLE':
+        return _keyring_class() is not None
+    if name == 'DeclarationMasterKeyRing':
+        return _keyring_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+TemporalEpoch = namedtuple('TemporalEpoch', ['day', 'phase', 'layer'])
+
+
+def _hashable(value) -> Hashable:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=str)
+
+
+def temporal_epoch(keyring=None) -> TemporalEpoch:
+    """
+    Epoch of the temporal inputs to key derivation.
+
+    A key derived with all systems changes when the DAUS day, the moon
+    phase or the Construct (26-hour) layer changes, so each is part of
+    the epoch. The phase comes from TemporalBinding.get_phase, a table
+    lookup once the ephemeris has been built; the layer is read from
+    `keyring` (a DeclarationMasterKeyRing) when given.
+
+    Chrony time is left out on purpose: it is a clock reading that moves
+    on every call, so including it would make every epoch one call long.
+    A cached key keeps the chrony_time of its derivation in
+    'derived_from'; bound how long it is reused with MoonKeyring(max_age=...).
+    """
+    from .temporal import TemporalBinding
+    now = datetime.now(timezone.utc)
+    day = int(now.timestamp() // 86400)
+    phase = TemporalBinding.get_phase(now) if TemporalBinding.is_available() else None
+    get_layer = getattr(keyring, 'get_current_layer', None)
+    layer = _hashable(get_layer()) if get_layer is not None else None
+    return TemporalEpoch(day, phase, layer)
+
+
+def epoch_label(epoch: Hashable) -> str:
+    """
+    Canonical text of an epoch: the HKDF salt and the root's path label.
+
+    "<day>:<phase>" (":<layer>" appended when the keyring reports one);
+    epochs from a custom epoch_func are encoded as compact sorted JSON.
+    """
+    if isinstance(epoch, TemporalEpoch):
+        label = f"{epoch.day}:{epoch.phase}"
+        return label if epoch.layer is None else f"{label}:{epoch.layer}"
+    return json.dumps(epoch, sort_keys=True, default=str, separators=(',', ':'))
+
+
+def hkdf_sha256(ikm: bytes, info: bytes, salt: bytes = b'',
+                length: int = CHILD_KEY_LENGTH) -> bytes:
+    """
+    HKDF-SHA256 (RFC 5869): extract a PRK from `ikm`, expand it with `info`.
+
+    Args:
+        ikm: Input keying material
+        info: Context binding the output to one use
+        salt: Optional salt (default: zero-length, i.e. HashLen zero bytes)
+        length: Output bytes (at most 255 × 32)
+    """
+    if length > 255 * hashlib.sha256().digest_size:
+        raise ValueError("HKDF-SHA256 output too long")
+    prk = hmac.new(salt or bytes(hashlib.sha256().digest_size), ikm, hashlib.sha256).digest()
+    okm, block, counter = b'', b'', 1
+    while len(okm) < length:
+        block = hmac.new(prk, block + info + bytes([counter]), hashlib.sha256).digest()
+        okm += block
+        counter += 1
+    return okm[:length]
+
+
+def _key_bytes(key: str) -> bytes:
+    """Keyring key material as bytes (hex-decoded when it is hex)"""
+    try:
+        return bytes.fromhex(key)
+    except ValueError:
+        return key.encode()
+
+
+def _child_key(root: bytes, salt: bytes, purpose: str, user: Optional[str]) -> bytes:
+    """HKDF purpose key from the epoch root, then the user key from that"""
+    key = hkdf_sha256(root, b'purpose:' + purpose.encode(), salt)
+    if user is not None:
+        key = hkdf_sha256(key, b'user:' + user.encode(), salt)
+    return key
+
+
+def _child_keys(root: bytes, salt: bytes,
+                requests: List[Tuple[str, Optional[str]]]) -> List[str]:
+    """Hex child keys for a chunk of (purpose, user) (process-pool worker)"""
+    return [_child_key(root, salt, purpose, user).hex() for purpose, user in requests]
+
+
+def _split_request(request: KeyRequest) -> Tuple[str, Optional[str]]:
+    if isinstance(request, str):
+        return request, None
+    purpose, user = request
+    return purpose, user
+
+
+def _zeroize(buffer: bytearray):
+    """Overwrite key material in place"""
+    buffer[:] = bytes(len(buffer))
+
+
+class DerivedKeyCache:
+    """
+    Bounded LRU cache of derived keys, scoped to one temporal epoch.
+
+    Key material is held in bytearrays so it can be overwritten: entries
+    are zeroized when evicted by LRU, when they exceed `max_age`, when
+    the epoch rolls over (all older entries at once), and on clear().
+
+    This only covers the cache's own buffer. Every hit returns the key as
+    a new immutable str, and the keyring's result is a str before it is
+    cached; those copies live until garbage-collected and cannot be wiped.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_KEY_CACHE_SIZE,
+                 max_age: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.epoch = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _drop(self, key: tuple):
+        entry = self._entries.pop(key)
+        _zeroize(entry['key'])
+        self.evictions += 1
+
+    def _roll(self, epoch: Hashable):
+        """Zeroize everything when the epoch changes"""
+        if epoch != self.epoch:
+            for key in list(self._entries):
+                self._drop(key)
+            self.epoch = epoch
+
+    def get(self, key: tuple, epoch: Hashable) -> Optional[Dict]:
+        """Cached key data for `key` in `epoch`, or None"""
+        with self._lock:
+            self._roll(epoch)
+            entry = self._entries.get(key)
+            if entry is not None and self.max_age is not None \
+                    and time.monotonic() - entry['created'] > self.max_age:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry['data'], key=entry['key'].decode())
+
+    def put(self, key: tuple, epoch: Hashable, data: Dict):
+        """Store key data; its 'key' field is kept in a zeroizable buffer"""
+        with self._lock:
+            self._roll(epoch)
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = {
+                'key': bytearray(str(data['key']).encode()),
+                'data': {k: v for k, v in data.items() if k != 'key'},
+                'created': time.monotonic()
+            }
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self):
+        """Zeroize and drop every entry"""
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'epoch': self.epoch
+            }
 
 
 class MoonKeyring:
@@ -32,25 +244,43 @@ class MoonKeyring:
     - DAUS Calendar
     """
 
-    def __init__(self):
-        if not MOON_AVAILABLE:
+    def __init__(self, cache_size: int = DEFAULT_KEY_CACHE_SIZE,
+                 max_age: Optional[float] = None,
+                 epoch_func: Optional[Callable[[], Hashable]] = None):
+        """
+        Args:
+            cache_size: Derived keys to keep (0 disables the cache)
+            max_age: Seconds a cached key may be reused (default: whole epoch)
+            epoch_func: Returns the current temporal epoch; cached keys are
+                        only reused within the epoch they were derived in
+                        (default: temporal_epoch of this keyring)
+        """
+        keyring_class = _keyring_class()
+        if keyring_class is None:
             raise RuntimeError("Moon system not available at /mnt/Vault/Moon")
 
-        self.keyring = DeclarationMasterKeyRing()
+        self.keyring = keyring_class()
+        self.key_cache = DerivedKeyCache(cache_size, max_age) if cache_size > 0 else None
+        self._root_cache = DerivedKeyCache(1, max_age)
+        self.epoch_func = epoch_func or (lambda: temporal_epoch(self.keyring))
         self._initialized = True
 
     @staticmethod
     def is_available():
         """Check if Moon keyring system is available"""
-        return MOON_AVAILABLE
+        return _keyring_class() is not None
 
-    def derive_key(self, purpose: str, use_all_systems: bool = True):
+    def derive_key(self, purpose: str, use_all_systems: bool = True, use_cache: bool = True):
         """
         Derive a key for a specific purpose.
 
+        Within one temporal epoch the same purpose yields the same key, so
+        results are served from the key cache until the epoch rolls over.
+
         Args:
             purpose: Purpose of the key (e.g., 'agent_auth', 'code_signing')
             use_all_systems: Use all temporal systems (default: True)
+            use_cache: Reuse a key derived earlier in this epoch (default: True)
 
         Returns:
             dict: Key data with derivation details
@@ -58,10 +288,173 @@ class MoonKeyring:
         if not self._initialized:
             raise RuntimeError("Keyring not initialized")
 
+        cache = self.key_cache if use_cache else None
+        epoch = self.epoch_func() if cache is not None else None
+        return self._derive(purpose, use_all_systems, cache, epoch)
+
+    def _derive(self, purpose: str, use_all_systems: bool,
+                cache: Optional[DerivedKeyCache], epoch: Hashable) -> Dict:
+        """Keyring derivation through `cache` (None: always derive)"""
+        if cache is not None:
+            cached = cache.get((purpose, use_all_systems), epoch)
+            if cached is not None:
+                return cached
+
         if use_all_systems:
-            return self.keyring.derive_key_with_all_systems(purpose)
+            data = self.keyring.derive_key_with_all_systems(purpose)
         else:
-            return self.keyring.derive_key(purpose)
+            data = self.keyring.derive_key(purpose)
+
+        if cache is not None:
+            cache.put((purpose, use_all_systems), epoch, data)
+        return data
+
+    def epoch_root(self, epoch: Optional[Hashable] = None) -> Dict:
+        """
+        Root key of a temporal epoch, a function of the seed and the epoch only.
+
+            root = HKDF(keyring.derive_key(EPOCH_ROOT_PURPOSE),
+                        info="epoch-root", salt=epoch_label(epoch))
+
+        The keyring's seed-only derivation is used rather than the
+        all-systems one, which mixes in chrony time: every process, and
+        every re-derivation after `max_age`, gets the same root (and so
+        the same child keys) for the same epoch.
+
+        Kept in its own single-entry cache, so it is never pushed out by
+        purpose keys and is zeroized when the epoch rolls over.
+        """
+        if not self._initialized:
+            raise RuntimeError("Keyring not initialized")
+        if epoch is None:
+            epoch = self.epoch_func()
+        cached = self._root_cache.get((EPOCH_ROOT_PURPOSE,), epoch)
+        if cached is not None:
+            return cached
+
+        label = epoch_label(epoch)
+        base = self.keyring.derive_key(EPOCH_ROOT_PURPOSE)
+        data = {
+            'key': hkdf_sha256(_key_bytes(base['key']), b'epoch-root', label.encode()).hex(),
+            'derived_from': base.get('derived_from'),
+            'epoch': label
+        }
+        self._root_cache.put((EPOCH_ROOT_PURPOSE,), epoch, data)
+        return data
+
+    def derive_child_key(self, purpose: str, user: Optional[str] = None,
+                         epoch: Optional[Hashable] = None) -> Dict:
+        """
+        Derive a per-purpose (and optionally per-user) key from the epoch root.
+
+        Two HKDF-SHA256 steps, salted with epoch_label(epoch):
+            purpose key = HKDF(root, info="purpose:<purpose>")
+            user key    = HKDF(purpose key, info="user:<user>")
+        Only the root goes through the keyring, so the cost per purpose or
+        user is a few HMACs.
+
+        Args:
+            purpose: Purpose of the key (e.g., 'agent_operation_code_review')
+            user: Optional user the key is bound to
+            epoch: Temporal epoch (default: current)
+
+        Returns:
+            dict: key (hex), derived_from, derivation_path and epoch
+        """
+        if epoch is None:
+            epoch = self.epoch_func()
+        root = self.epoch_root(epoch)
+        key = _child_key(_key_bytes(root['key']), epoch_label(epoch).encode(), purpose, user)
+        return self._child_data(root, epoch, purpose, user, key.hex())
+
+    @staticmethod
+    def _child_data(root: Dict, epoch: Hashable, purpose: str,
+                    user: Optional[str], key: str) -> Dict:
+        path = [f"{EPOCH_ROOT_PURPOSE}@{epoch_label(epoch)}", f"hkdf-sha256:purpose:{purpose}"]
+        if user is not None:
+            path.append(f"hkdf-sha256:user:{user}")
+        return {
+            'key': key,
+            'derived_from': root.get('derived_from'),
+            'derivation_path': path,
+            'epoch': epoch_label(epoch)
+        }
+
+    def derive_child_keys(self, requests: Iterable[KeyRequest], processes: Optional[int] = None,
+                          chunk_size: int = DEFAULT_BATCH_CHUNK) -> Iterator[Tuple[KeyRequest, Dict]]:
+        """
+        derive_child_key for many purposes in one pass.
+
+        These are HKDF child keys of the epoch root, not the keys derive_key
+        returns for the same purpose: they only match what a verifier using
+        child keys (MoonAuth(hierarchical_keys=True)) derives.
+
+        The temporal epoch and its root key are resolved when this method is
+        called, not on the first next(), and used for the whole batch, so
+        every key belongs to that epoch even if the batch runs across a
+        rollover. `requests` is consumed lazily in chunks and results are
+        yielded in input order, so memory stays bounded by a few chunks
+        however long the input is.
+
+        Each key is a few HMACs, so the process pool only pays off for very
+        large batches. It also pickles the raw root key bytes into every
+        worker process, where they cannot be zeroized.
+
+        Args:
+            requests: Purposes, or (purpose, user) pairs
+            processes: Fan chunks out to this many worker processes
+                (default: derive in this process)
+            chunk_size: Requests per chunk
+
+        Returns:
+            Iterator of (request, key data) as returned by derive_child_key
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        epoch = self.epoch_func()
+        root = self.epoch_root(epoch)
+        return self._iter_child_keys(iter(requests), epoch, root, processes, chunk_size)
+
+    def _iter_child_keys(self, source: Iterator[KeyRequest], epoch: Hashable, root: Dict,
+                         processes: Optional[int],
+                         chunk_size: int) -> Iterator[Tuple[KeyRequest, Dict]]:
+        root_key = _key_bytes(root['key'])
+        salt = epoch_label(epoch).encode()
+
+        def chunks():
+            while True:
+                chunk = list(islice(source, chunk_size))
+                if not chunk:
+                    return
+                yield chunk, [_split_request(r) for r in chunk]
+
+        def emit(chunk, split, keys):
+            for request, (purpose, user), key in zip(chunk, split, keys):
+                yield request, self._child_data(root, epoch, purpose, user, key)
+
+        if not processes or processes < 2:
+            for chunk, split in chunks():
+                yield from emit(chunk, split, _child_keys(root_key, salt, split))
+            return
+
+        # Keep at most two chunks per worker in flight
+        with ProcessPoolExecutor(processes) as pool:
+            pending = deque()
+            for chunk, split in chunks():
+                pending.append((chunk, split, pool.submit(_child_keys, root_key, salt, split)))
+                if len(pending) >= 2 * processes:
+                    chunk, split, future = pending.popleft()
+                    yield from emit(chunk, split, future.result())
+            while pending:
+                chunk, split, future = pending.popleft()
+                yield from emit(chunk, split, future.result())
+
+    def clear_key_cache(self):
+        """Zeroize all cached key material"""
+        if self.key_cache is not None:
+            self.key_cache.clear()
+        self._root_cache.clear()
 
     def get_master_seed(self):
         """Get the master seed hash (first 32 chars)"""
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Temporal Refresher
+==================
+One process per host computes temporal coordinates; every other
+process reads them from shared memory.
+
+The refresher recomputes the coordinates on an interval and, only when
+they change:
+    - publishes them into a fixed-layout multiprocessing.shared_memory
+      block guarded by a seqlock version counter
+    - rewrites the snapshot JSON file atomically (write, then rename)
+
+Readers never take a lock: they read the version, copy the payload and
+re-read the version, retrying if a write was in progress (odd version)
+or happened meanwhile (version changed). A block that is not a snapshot,
+or one left mid-write by a refresher that died, reads as nothing
+published, so callers fall back to computing coordinates themselves.
+
+Shared block layout (little-endian):
+    magic "MTMP" | version u16 | reserved u16 | seq u64 |
+    refreshed_at f64 | length u32 | pad | payload (UTF-8 JSON)
+"""
+
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    from multiprocessing import shared_memory
+    SHARED_MEMORY_AVAILABLE = True
+except ImportError:
+    SHARED_MEMORY_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .config import MoonConfig
+from .temporal import TemporalBinding
+
+SHM_NAME = "moon_temporal"
+MAGIC = b'MTMP'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQdI4x')
+SEQ_OFFSET = 8
+REFRESHED_OFFSET = 16
+PAYLOAD_CAPACITY = 16384
+
+DEFAULT_INTERVAL = 60.0
+# Readers ignore a snapshot not refreshed for this long (refresher gone)
+DEFAULT_MAX_AGE = 3 * DEFAULT_INTERVAL
+READ_RETRIES = 100
+
+# Coordinates compared for change detection (the timestamp always moves)
+VOLATILE_FIELDS = ('timestamp_utc',)
+
+# Blocks created by a refresher in this process (their owner unlinks them)
+_created = set()
+
+
+def _attach(name: str):
+    """Attach to an existing block without adopting it for cleanup"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before 3.13 attaching registers the block with the resource
+        # tracker, which would unlink it when this reader exits
+        block = shared_memory.SharedMemory(name=name)
+        if name in _created:
+            return block
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(block._name, 'shared_memory')
+        except Exception:
+            pass
+        return block
+
+
+def write_json_atomic(path: Union[str, Path], data: Dict) -> bool:
+    """
+    Write JSON via a temp file and rename, skipping identical content.
+
+    Returns:
+        bool: True if the file was (re)written
+    """
+    path = Path(path)
+    content = json.dumps(data, indent=2, sort_keys=True).encode()
+    try:
+        if path.read_bytes() == content:
+            return False
+    except OSError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+def _stable(coords: Dict) -> Dict:
+    return {k: v for k, v in coords.items() if k not in VOLATILE_FIELDS}
+
+
+class TemporalRefresher:
+    """
+    Host-wide publisher of temporal coordinates.
+
+    Only one refresher per host runs: `start()` takes an exclusive lock
+    file and returns False if another process already holds it.
+
+    Usage:
+        refresher = TemporalRefresher()
+        refresher.start()               # in one service process
+        read_shared_coordinates()       # in any process
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, name: str = SHM_NAME,
+                 snapshot_path: Optional[Union[str, Path]] = None):
+        if not SHARED_MEMORY_AVAILABLE:
+            raise RuntimeError("multiprocessing.shared_memory not available")
+        self.interval = interval
+        self.name = name
+        self.snapshot_path = Path(snapshot_path or MoonConfig.TEMPORAL_SNAPSHOT_PATH)
+        self.lock_path = Path(tempfile.gettempdir()) / f"{name}.lock"
+        self.writes = 0
+        self._block = None
+        self._lock_file = None
+        self._last = None
+        self._seq = 0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _acquire_host_lock(self) -> bool:
+        self._lock_file = open(self.lock_path, 'w')
+        if fcntl is None:
+            return True
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+
+    def _open_block(self):
+        size = HEADER.size + PAYLOAD_CAPACITY
+        try:
+            self._block = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+            _created.add(self.name)
+        except FileExistsError:
+            # Left behind by a previous refresher on this host
+            self._block = _attach(self.name)
+            self._seq = HEADER.unpack_from(self._block.buf, 0)[3] & ~1
+        HEADER.pack_into(self._block.buf, 0, MAGIC, VERSION, 0, self._seq, 0.0, 0)
+
+    def publish(self, coords: Dict):
+        """Write a payload into the shared block under the seqlock"""
+        payload = json.dumps(coords, sort_keys=True).encode()
+        if len(payload) > PAYLOAD_CAPACITY:
+            raise ValueError(f"Temporal snapshot too large ({len(payload)} bytes)")
+
+        buf = self._block.buf
+        self._seq += 1
+        struct.pack_into('<Q', buf, SEQ_OFFSET, self._seq)        # odd: writing
+        buf[HEADER.size:HEADER.size + len(payload)] = payload
+        HEADER.pack_into(buf, 0, MAGIC, VERSION, 0, self._seq, time.time(), len(payload))
+        self._seq += 1
+        struct.pack_into('<Q', buf, SEQ_OFFSET, self._seq)        # even: stable
+
+    def touch(self):
+        """Mark the published payload as still current (under the seqlock)"""
+        buf = self._block.buf
+        self._seq += 1
+        struct.pack_into('<Q', buf, SEQ_OFFSET, self._seq)
+        struct.pack_into('<d', buf, REFRESHED_OFFSET, time.time())
+        self._seq += 1
+        struct.pack_into('<Q', buf, SEQ_OFFSET, self._seq)
+
+    def refresh(self) -> bool:
+        """
+        Recompute once; publish and write the file only on change.
+
+        Returns:
+            bool: True if the coordinates changed
+        """
+        coords = TemporalBinding.get_all_temporal_coordinates(use_cache=False)
+        changed = self._last is None or _stable(coords) != _stable(self._last)
+        if changed:
+            self.publish(coords)
+            if write_json_atomic(self.snapshot_path, _stable(coords)):
+                self.writes += 1
+            self._last = coords
+        else:
+            self.touch()
+        return changed
+
+    def _loop(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Warning: Temporal refresh failed: {e}")
+            self._stopped.wait(self.interval)
+
+    def start(self) -> bool:
+        """
+        Become this host's refresher and start refreshing in the background.
+
+        Returns:
+            bool: False if another process is already the refresher
+        """
+        if not self._acquire_host_lock():
+            return False
+        self._open_block()
+        self._thread = threading.Thread(target=self._loop, name="moon-refresher", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, unlink: bool = True):
+        """Stop refreshing; with `unlink`, remove the shared block"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._block is not None:
+            self._block.close()
+            if unlink:
+                self._block.unlink()
+                _created.discard(self.name)
+            self._block = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+class SharedCoordinates:
+    """Lock-free reader of the refresher's shared block"""
+
+    def __init__(self, name: str = SHM_NAME):
+        self._block = _attach(name)
+        self._cache_seq = None
+        self._cache = None
+
+    def close(self):
+        self._block.close()
+
+    def read(self) -> Optional[Dict]:
+        """
+        Current coordinates, or None if nothing is published yet.
+
+        Raises:
+            RuntimeError: If no consistent read succeeds (writer stuck)
+        """
+        buf = self._block.buf
+        for _ in range(READ_RETRIES):
+            magic, version, _, seq, refreshed_at, length = HEADER.unpack_from(buf, 0)
+            if magic != MAGIC or version != VERSION:
+                raise RuntimeError(f"Not a temporal snapshot block: {self._block.name}")
+            if seq & 1:
+                time.sleep(0)
+                continue
+            payload = None if seq == self._cache_seq else bytes(buf[HEADER.size:HEADER.size + length])
+            if struct.unpack_from('<Q', buf, SEQ_OFFSET)[0] != seq:
+                continue
+            if not length:
+                return None
+            if payload is not None:
+                self._cache_seq, self._cache = seq, json.loads(payload)
+            return dict(self._cache, refreshed_at=refreshed_at)
+        raise RuntimeError("Temporal snapshot kept changing while being read")
+
+
+_reader: Optional[SharedCoordinates] = None
+
+
+def read_shared_coordinates(max_age: Optional[float] = DEFAULT_MAX_AGE) -> Optional[Dict]:
+    """
+    Coordinates published by this host's refresher, if one is running.
+
+    Args:
+        max_age: Ignore snapshots whose last refresh is older than this
+            (default: three refresh intervals; None accepts any age)
+
+    Returns:
+        dict with 'refreshed_at' (and 'timestamp_utc' set to now), or None
+    """
+    global _reader
+    if not SHARED_MEMORY_AVAILABLE:
+        return None
+    if _reader is None:
+        try:
+            _reader = SharedCoordinates()
+        except FileNotFoundError:
+            return None
+
+    try:
+        coords = _reader.read()
+    except (RuntimeError, ValueError):
+        # Not a snapshot block, or its refresher died mid-write
+        coords = None
+        stale = True
+    else:
+        stale = coords is not None and max_age is not None and \
+            time.time() - coords['refreshed_at'] > max_age
+    if stale:
+        # Refresher gone or restarted: re-attach on the next call
+        _reader.close()
+        _reader = None
+        return None
+    if coords is None:
+        return None
+    coords['timestamp_utc'] = datetime.now(timezone.utc).isoformat()
+    return coords
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Publish temporal coordinates for this host")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL)
+    args = parser.parse_args()
+
+    refresher = TemporalRefresher(args.interval)
+    if not refresher.start():
+        print("Another temporal refresher is already running on this host")
+        raise SystemExit(1)
+    print(f"Publishing temporal coordinates to shared memory '{SHM_NAME}'")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        refresher.stop()
@@ -5,26 +5,188 @@ Temporal Binding System
 Wrapper for temporal binding from /mnt/Vault/Moon
 """
 
-import sys
-from pathlib import Path
+import copy
+import heapq
+import itertools
+import threading
+import time
 from datetime import datetime, timezone
 
-# Add Moon directory to path
-moon_path = Path("/mnt/Vault/Moon")
-if moon_path.exists() and str(moon_path) not in sys.path:
-    sys.path.insert(0, str(moon_path))
+from . import vault
+from .ephemeris import Ephemeris, EphemerisError
 
-try:
-    from temporal_binding import (
-        get_system_time,
-        calculate_moon_phase,
-        calculate_daus_calendar,
-        calculate_kings_position,
-        update_json_files
-    )
-    TEMPORAL_AVAILABLE = True
-except ImportError:
-    TEMPORAL_AVAILABLE = False
+
+def _binding():
+    """The Vault temporal_binding module, or None (imported on first use)"""
+    return vault.load('temporal_binding')
+
+
+def __getattr__(name):
+    # Former import-time flag, now resolved on first access
+    if name == 'TEMPORAL_AVAILABLE':
+        return _binding() is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Coordinates are recomputed once per bucket (one UTC day by default)
+COORDINATE_BUCKET_SECONDS = 86400
+
+# Moon phases in which each operation is recommended
+OPERATION_PHASES = {
+    'key_generation': ['New Moon', 'Waxing Crescent'],
+    'seal': ['Full Moon'],
+    'flow': ['First Quarter', 'Last Quarter'],
+    'accumulate': ['Waxing Gibbous'],
+    'return': ['Waning Gibbous', 'Waning Crescent']
+}
+
+
+def compile_operation_phases(operation_phases=None):
+    """
+    Precompile an operation -> phases table into phase -> bitmask form.
+
+    Returns:
+        (operation bits, phase masks): each restricted operation gets one
+        bit; a phase's mask has the bits of every operation it allows
+    """
+    operation_phases = OPERATION_PHASES if operation_phases is None else operation_phases
+    restricted = [op for op, phases in operation_phases.items() if phases]
+    bits = {op: 1 << i for i, op in enumerate(restricted)}
+    masks = {}
+    for op in restricted:
+        for phase in operation_phases[op]:
+            masks[phase] = masks.get(phase, 0) | bits[op]
+    return bits, masks
+
+
+# Recompile (call compile_operation_phases) after changing OPERATION_PHASES
+OPERATION_BITS, PHASE_MASKS = compile_operation_phases()
+
+# Live phase-boundary search: scan step and horizon (just over a lunation)
+PHASE_SCAN_STEP = 3600
+PHASE_SCAN_HORIZON = 31 * 86400
+
+
+class CoordinateCache:
+    """
+    Temporal coordinates memoized until the next change of state.
+
+    DAUS day and Kings position change at UTC midnight; moon phase and
+    the beacon fields change at phase boundaries, which can fall partway
+    through a day. An entry therefore expires at whichever comes first:
+    the next bucket boundary (UTC midnight by default) or the next phase
+    change reported by `next_change`.
+    """
+
+    def __init__(self, bucket_seconds: int = COORDINATE_BUCKET_SECONDS, next_change=None):
+        self.bucket_seconds = bucket_seconds
+        self.next_change = next_change
+        self.hits = 0
+        self.misses = 0
+        self._bucket = None
+        self._expires = None
+        self._coords = None
+        self._lock = threading.Lock()
+
+    def bucket(self, now: datetime) -> int:
+        """Bucket number of a UTC datetime"""
+        return int(now.timestamp() // self.bucket_seconds)
+
+    def boundary(self, bucket: int) -> datetime:
+        """Start of the bucket after `bucket`"""
+        return datetime.fromtimestamp((bucket + 1) * self.bucket_seconds, timezone.utc)
+
+    def _expiry(self, now: datetime, bucket: int) -> float:
+        """Epoch seconds at which coordinates computed at `now` go stale"""
+        expires = self.boundary(bucket).timestamp()
+        if self.next_change is not None:
+            try:
+                expires = min(expires, self.next_change(now.timestamp()))
+            except Exception:
+                pass
+        return expires
+
+    def get(self, now: datetime, compute):
+        """
+        Coordinates for `now`, calling `compute(now)` when the entry is stale.
+
+        Returns a copy; its 'timestamp_utc' is when the coordinates were
+        computed, not the request time.
+        """
+        bucket = self.bucket(now)
+        ts = now.timestamp()
+        with self._lock:
+            if self._bucket == bucket and ts < self._expires:
+                self.hits += 1
+                coords = self._coords
+            else:
+                self.misses += 1
+                coords = compute(now)
+                self._bucket = bucket
+                self._expires = self._expiry(now, bucket)
+                self._coords = coords
+
+        return copy.deepcopy(coords)
+
+    def clear(self):
+        """Drop the cached entry (statistics are kept)"""
+        with self._lock:
+            self._bucket = None
+            self._expires = None
+            self._coords = None
+
+    def stats(self):
+        """Hit/miss counters and the current entry's expiry"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'bucket_seconds': self.bucket_seconds,
+                'expires_at': (datetime.fromtimestamp(self._expires, timezone.utc).isoformat()
+                               if self._expires is not None else None)
+            }
+
+
+def _phase_boundary(ts: float) -> float:
+    """Epoch seconds of the next moon phase change after `ts`"""
+    return _next_phase_change(ts)[0]
+
+
+_coordinate_cache = CoordinateCache(next_change=_phase_boundary)
+
+# (moon, daus, kings) last written by update_temporal_files
+_last_written = None
+
+# Opened on first phase lookup and kept once open
+_ephemeris = None
+# When a missing or unreadable table was last looked for (monotonic)
+_ephemeris_checked = None
+# Seconds before looking again for a table that was not there
+EPHEMERIS_RETRY_SECONDS = 60.0
+
+
+def _get_ephemeris():
+    """
+    The default ephemeris table, or None if it has not been built.
+
+    A missing or corrupt table is looked for again after
+    EPHEMERIS_RETRY_SECONDS, so one built later with
+    `python -m moon.ephemeris` gets picked up.
+    """
+    global _ephemeris, _ephemeris_checked
+    if _ephemeris is not None:
+        return _ephemeris
+    now = time.monotonic()
+    if _ephemeris_checked is not None and now - _ephemeris_checked < EPHEMERIS_RETRY_SECONDS:
+        return None
+    _ephemeris_checked = now
+    try:
+        _ephemeris = Ephemeris.open()
+    except (OSError, EphemerisError):
+        _ephemeris = None
+    return _ephemeris
 
 
 class TemporalBinding:
@@ -39,14 +201,15 @@ class TemporalBinding:
     @staticmethod
     def is_available():
         """Check if temporal binding system is available"""
-        return TEMPORAL_AVAILABLE
+        return _binding() is not None
 
     @staticmethod
     def get_current_time():
         """Get current system time with NTP sync info"""
-        if not TEMPORAL_AVAILABLE:
+        binding = _binding()
+        if binding is None:
             return datetime.now(timezone.utc), {}
-        return get_system_time()
+        return binding.get_system_time()
 
     @staticmethod
     def get_moon_phase(date=None):
@@ -59,13 +222,38 @@ class TemporalBinding:
         Returns:
             dict: Moon phase data with glyph and operation
         """
-        if not TEMPORAL_AVAILABLE:
+        binding = _binding()
+        if binding is None:
             raise RuntimeError("Temporal binding not available")
 
         if date is None:
             date = datetime.now(timezone.utc)
 
-        return calculate_moon_phase(date)
+        return binding.calculate_moon_phase(date)
+
+    @staticmethod
+    def get_phase(date=None) -> str:
+        """
+        Moon phase name only, from the ephemeris table when it covers `date`.
+
+        A bisect over the memory-mapped table instead of the astronomy;
+        falls back to calculate_moon_phase outside the table or if no
+        table has been built (see moon.ephemeris.build_ephemeris).
+
+        Args:
+            date: datetime object (default: now)
+
+        Returns:
+            str: Phase name, e.g. 'Full Moon'
+        """
+        if date is None:
+            date = datetime.now(timezone.utc)
+
+        ephemeris = _get_ephemeris()
+        if ephemeris is not None and ephemeris.covers(date.timestamp()):
+            return ephemeris.phase(date)
+
+        return TemporalBinding.get_moon_phase(date)['phase']
 
     @staticmethod
     def get_daus_calendar(date=None):
@@ -78,13 +266,14 @@ class TemporalBinding:
         Returns:
             dict: DAUS calendar data
         """
-        if not TEMPORAL_AVAILABLE:
+        binding = _binding()
+        if binding is None:
             raise RuntimeError("Temporal binding not available")
 
         if date is None:
             date = datetime.now(timezone.utc)
 
-        return calculate_daus_calendar(date)
+        return binding.calculate_daus_calendar(date)
 
     @staticmethod
     def get_kings_position(date=None):
@@ -97,113 +286,419 @@ class TemporalBinding:
         Returns:
             dict: Kings position data
         """
-        if not TEMPORAL_AVAILABLE:
+        binding = _binding()
+        if binding is None:
             raise RuntimeError("Temporal binding not available")
 
         if date is None:
             date = datetime.now(timezone.utc)
 
-        return calculate_kings_position(date)
+        return binding.calculate_kings_position(date)
 
     @staticmethod
-    def get_all_temporal_coordinates():
-        """Get all current temporal coordinates"""
-        if not TEMPORAL_AVAILABLE:
-            raise RuntimeError("Temporal binding not available")
-
-        now_utc, _ = get_system_time()
-
+    def _compute_coordinates(now_utc):
+        """Compute every temporal coordinate for one instant"""
+        binding = _binding()
         coords = {
-            'moon_phase': calculate_moon_phase(now_utc),
-            'daus_calendar': calculate_daus_calendar(now_utc),
-            'kings_position': calculate_kings_position(now_utc),
+            'moon_phase': binding.calculate_moon_phase(now_utc),
+            'daus_calendar': binding.calculate_daus_calendar(now_utc),
+            'kings_position': binding.calculate_kings_position(now_utc),
             'timestamp_utc': now_utc.isoformat()
         }
         # Include beacon state if available (new apex model)
-        try:
-            from apex_beacon import compute_beacon_state, load_moon_phase_file
-            moon_json = load_moon_phase_file()
-            beacon = compute_beacon_state(now_utc=now_utc, moon_json=moon_json)
-            coords["beacon"] = {
-                "hemisphere": beacon.hemisphere,
-                "layer": beacon.layer,
-                "cosmic_value": beacon.cosmic_value,
-                "moon_day_0_full_to_new_30": beacon.moon_day_0_full_to_new_30,
-                "waxing_or_waning": beacon.waxing_or_waning,
-                "arcanum": beacon.arcanum,
-                "hash": beacon.hash,
-            }
-        except Exception:
-            pass
+        apex = vault.load('apex_beacon')
+        if apex is not None:
+            try:
+                moon_json = apex.load_moon_phase_file()
+                beacon = apex.compute_beacon_state(now_utc=now_utc, moon_json=moon_json)
+                coords["beacon"] = {
+                    "hemisphere": beacon.hemisphere,
+                    "layer": beacon.layer,
+                    "cosmic_value": beacon.cosmic_value,
+                    "moon_day_0_full_to_new_30": beacon.moon_day_0_full_to_new_30,
+                    "waxing_or_waning": beacon.waxing_or_waning,
+                    "arcanum": beacon.arcanum,
+                    "hash": beacon.hash,
+                }
+            except Exception:
+                pass
         return coords
 
+    @staticmethod
+    def get_moon_phases(timestamps):
+        """Batch get_phase: int8 phase codes indexing ephemeris.PHASE_NAMES"""
+        from .batch import moon_phases
+        return moon_phases(timestamps)
+
+    @staticmethod
+    def get_daus_calendars(timestamps):
+        """Batch get_daus_calendar: int32 'year', 'month', 'day' columns"""
+        from .batch import daus_calendars
+        return daus_calendars(timestamps)
+
+    @staticmethod
+    def get_kings_positions(timestamps):
+        """Batch get_kings_position: int16 'era' codes and the 'eras' they index"""
+        from .batch import kings_positions
+        return kings_positions(timestamps)
+
+    @staticmethod
+    def get_temporal_columns(timestamps):
+        """
+        Batch variant of the getters for arrays of timestamps.
+
+        Args:
+            timestamps: NumPy datetime64 array or epoch seconds
+
+        Returns:
+            dict: Columnar phase codes, DAUS year/month/day and Kings era
+                  codes (see moon.batch.temporal_columns)
+        """
+        from .batch import temporal_columns
+        return temporal_columns(timestamps)
+
+    @staticmethod
+    def get_all_temporal_coordinates(use_cache: bool = True):
+        """
+        Get all current temporal coordinates.
+
+        Args:
+            use_cache: Reuse coordinates computed earlier, until the next
+                       UTC midnight or moon phase change (default: True);
+                       False recomputes them with a synced system time
+
+        Returns:
+            dict: moon_phase, daus_calendar, kings_position, timestamp_utc
+                  and, when apex_beacon is importable, beacon
+        """
+        binding = _binding()
+        if binding is None:
+            raise RuntimeError("Temporal binding not available")
+
+        if not use_cache:
+            now_utc, _ = binding.get_system_time()
+            return TemporalBinding._compute_coordinates(now_utc)
+
+        return _coordinate_cache.get(datetime.now(timezone.utc),
+                                     TemporalBinding._compute_coordinates)
+
+    @staticmethod
+    def cache_stats():
+        """Hit/miss statistics of the coordinate cache"""
+        return _coordinate_cache.stats()
+
+    @staticmethod
+    def clear_cache():
+        """Force the next coordinate lookup to recompute"""
+        _coordinate_cache.clear()
+
     @staticmethod
     def update_temporal_files():
-        """Update the JSON files with current temporal data"""
-        if not TEMPORAL_AVAILABLE:
+        """
+        Update the JSON files with current temporal data.
+
+        The files are only rewritten when the values differ from the last
+        update made by this process.
+        """
+        global _last_written
+        binding = _binding()
+        if binding is None:
             raise RuntimeError("Temporal binding not available")
 
-        now_utc, _ = get_system_time()
-        moon = calculate_moon_phase(now_utc)
-        daus = calculate_daus_calendar(now_utc)
-        kings = calculate_kings_position(now_utc)
+        now_utc, _ = binding.get_system_time()
+        moon = binding.calculate_moon_phase(now_utc)
+        daus = binding.calculate_daus_calendar(now_utc)
+        kings = binding.calculate_kings_position(now_utc)
 
-        update_json_files(moon, daus, kings)
+        written = (moon, daus, kings) != _last_written
+        if written:
+            binding.update_json_files(moon, daus, kings)
+            _last_written = (moon, daus, kings)
 
         return {
             'moon_phase': moon,
             'daus_calendar': daus,
-            'kings_position': kings
+            'kings_position': kings,
+            'written': written
         }
 
     @staticmethod
-    def validate_temporal_operation(operation: str):
+    def get_shared_coordinates(max_age=None):
+        """
+        Coordinates from this host's TemporalRefresher, if one is running.
+
+        A lock-free read of shared memory; falls back to
+        get_all_temporal_coordinates when nothing is published or the
+        snapshot is stale.
+
+        Args:
+            max_age: Seconds after which a published snapshot is ignored
+                     (default: three refresh intervals, DEFAULT_MAX_AGE)
+        """
+        from .refresher import DEFAULT_MAX_AGE, read_shared_coordinates
+        coords = read_shared_coordinates(DEFAULT_MAX_AGE if max_age is None else max_age)
+        if coords is not None:
+            return coords
+        return TemporalBinding.get_all_temporal_coordinates()
+
+    @staticmethod
+    def validate_temporal_operation(operation: str, coords=None):
         """
         Validate if an operation is appropriate for current temporal state.
 
         Args:
             operation: Operation type (e.g., 'key_generation', 'seal', 'flow')
+            coords: Temporal coordinates to validate against (default: current)
 
         Returns:
             dict: Validation result with recommendations
         """
-        if not TEMPORAL_AVAILABLE:
-            return {'valid': True, 'reason': 'Temporal validation not available'}
+        return TemporalBinding.validate_operations([operation], coords)[operation]
+
+    @staticmethod
+    def validate_operations(ops, coords=None):
+        """
+        Validate any number of operations against one temporal snapshot.
+
+        The coordinates are fetched once (or taken from `coords`), and each
+        operation is then a single bit test against the current phase's
+        mask in PHASE_MASKS.
+
+        Args:
+            ops: Operation types
+            coords: Temporal coordinates to validate against (default: current)
+
+        Returns:
+            dict: Operation -> validation result (as validate_temporal_operation)
+        """
+        if coords is None:
+            if _binding() is None:
+                return {op: {'valid': True, 'reason': 'Temporal validation not available'}
+                        for op in ops}
+            coords = TemporalBinding.get_all_temporal_coordinates()
 
-        coords = TemporalBinding.get_all_temporal_coordinates()
         moon_phase = coords['moon_phase']
+        current_phase = moon_phase['phase']
+        allowed = PHASE_MASKS.get(current_phase, 0)
+
+        results = {}
+        for operation in ops:
+            bit = OPERATION_BITS.get(operation)
+            if bit is None:
+                results[operation] = {
+                    'valid': True,
+                    'reason': 'Operation type not restricted by temporal state',
+                    'current_phase': current_phase
+                }
+            elif allowed & bit:
+                results[operation] = {
+                    'valid': True,
+                    'reason': f'Operation {operation} is optimal during {current_phase}',
+                    'current_phase': current_phase,
+                    'glyph': moon_phase['glyph']
+                }
+            else:
+                recommended_phases = OPERATION_PHASES[operation]
+                results[operation] = {
+                    'valid': False,
+                    'reason': f'Operation {operation} is recommended during {recommended_phases}, currently {current_phase}',
+                    'current_phase': current_phase,
+                    'recommended_phases': recommended_phases,
+                    'glyph': moon_phase['glyph']
+                }
+        return results
+
+    @staticmethod
+    def next_window(operation: str, after=None):
+        """
+        Next window in which an operation's recommended phases hold.
+
+        Args:
+            operation: Operation type (a key of OPERATION_PHASES)
+            after: datetime to search from (default: now)
+
+        Returns:
+            dict: start and end datetimes, phases, and whether the window is
+                  already active; None if the operation is not restricted
+        """
+        phases = OPERATION_PHASES.get(operation)
+        if not phases:
+            return None
 
-        # Map operations to moon phases
-        operation_phases = {
-            'key_generation': ['New Moon', 'Waxing Crescent'],
-            'seal': ['Full Moon'],
-            'flow': ['First Quarter', 'Last Quarter'],
-            'accumulate': ['Waxing Gibbous'],
-            'return': ['Waning Gibbous', 'Waning Crescent']
+        if after is None:
+            after = datetime.now(timezone.utc)
+        ts = after.timestamp()
+
+        start = ts
+        phase = TemporalBinding.get_phase(after)
+        while phase not in phases:
+            start, phase = _next_phase_change(start)
+
+        end = start
+        while phase in phases:
+            end, phase = _next_phase_change(end)
+
+        return {
+            'operation': operation,
+            'phases': phases,
+            'start': _utc(start),
+            'end': _utc(end),
+            'active': start == ts
         }
 
-        current_phase = moon_phase['phase']
-        recommended_phases = operation_phases.get(operation, [])
 
-        if not recommended_phases:
-            return {
-                'valid': True,
-                'reason': 'Operation type not restricted by temporal state',
-                'current_phase': current_phase
-            }
+def _utc(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc)
 
-        if current_phase in recommended_phases:
-            return {
-                'valid': True,
-                'reason': f'Operation {operation} is optimal during {current_phase}',
-                'current_phase': current_phase,
-                'glyph': moon_phase['glyph']
-            }
-        else:
-            return {
-                'valid': False,
-                'reason': f'Operation {operation} is recommended during {recommended_phases}, currently {current_phase}',
-                'current_phase': current_phase,
-                'recommended_phases': recommended_phases,
-                'glyph': moon_phase['glyph']
-            }
+
+def _next_phase_change(ts: float):
+    """
+    (epoch seconds, new phase) of the first phase change after `ts`.
+
+    Read from the ephemeris when it covers `ts`; otherwise found by
+    scanning the live calculation hourly and bisecting to the second.
+    """
+    ephemeris = _get_ephemeris()
+    if ephemeris is not None:
+        found = ephemeris.next_transition(ts)
+        if found is not None:
+            return found
+
+    phase = TemporalBinding.get_phase(_utc(ts))
+    lo = int(ts)
+    while lo - ts < PHASE_SCAN_HORIZON:
+        hi = lo + PHASE_SCAN_STEP
+        if TemporalBinding.get_phase(_utc(hi)) != phase:
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if TemporalBinding.get_phase(_utc(mid)) == phase:
+                    lo = mid
+                else:
+                    hi = mid
+            return hi, TemporalBinding.get_phase(_utc(hi))
+        lo = hi
+    raise RuntimeError("No moon phase change found within a lunation")
+
+
+class ScheduledOperation:
+    """Handle for a deferred operation queued on a TemporalScheduler"""
+
+    def __init__(self, operation: str, callback, args, kwargs, window):
+        self.operation = operation
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.window = window
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def cancel(self) -> bool:
+        """Drop the operation if it has not fired yet"""
+        if self.done:
+            return False
+        self.cancelled = True
+        self._done.set()
+        return True
+
+    def wait(self, timeout=None) -> bool:
+        """Block until the operation has run (or been cancelled)"""
+        return self._done.wait(timeout)
+
+
+class TemporalScheduler:
+    """
+    Runs deferred operations when their moon-phase window opens.
+
+    Instead of polling validate_temporal_operation, callers schedule a
+    callback; its window start is computed once and pushed on a single
+    timer heap served by one thread. Operations whose window is already
+    open, or that are not phase-restricted, fire immediately. Callbacks
+    run on the scheduler thread.
+
+    Usage:
+        scheduler = TemporalScheduler()
+        job = scheduler.schedule('seal', seal_covenant, covenant_id)
+        job.wait()
+    """
+
+    # Longest single sleep, so wall-clock jumps are noticed
+    MAX_SLEEP = 60.0
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def schedule(self, operation: str, callback, *args, **kwargs) -> ScheduledOperation:
+        """
+        Run `callback(*args, **kwargs)` in the next window for `operation`.
+
+        Returns:
+            ScheduledOperation: Handle with window, wait(), cancel(), result
+        """
+        window = TemporalBinding.next_window(operation)
+        job = ScheduledOperation(operation, callback, args, kwargs, window)
+        fire_at = time.time() if window is None or window['active'] else window['start'].timestamp()
+        self._push(fire_at, job)
+        return job
+
+    def _push(self, fire_at: float, job: ScheduledOperation):
+        with self._cond:
+            heapq.heappush(self._heap, (fire_at, next(self._seq), job))
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name="moon-scheduler",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.time()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(min(delay, self.MAX_SLEEP))
+                if self._stopped:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+
+            if job.cancelled:
+                continue
+
+            try:
+                # Boundaries are to the second; if we woke just early, re-arm
+                phases = OPERATION_PHASES.get(job.operation)
+                if phases and TemporalBinding.get_phase() not in phases:
+                    job.window = TemporalBinding.next_window(job.operation)
+                    self._push(job.window['start'].timestamp(), job)
+                    continue
+                job.result = job.callback(*job.args, **job.kwargs)
+            except Exception as e:
+                # Fail this job only; the thread keeps serving the others
+                job.error = e
+            job._done.set()
+
+    def pending(self):
+        """Operations waiting for their window, soonest first"""
+        with self._cond:
+            return [(_utc(fire_at), job) for fire_at, _, job in sorted(self._heap)
+                    if not job.cancelled]
+
+    def stop(self):
+        """Stop the timer thread; queued operations stay queued"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
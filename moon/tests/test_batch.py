@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Batch Temporal Computation Tests
+================================
+Vectorized moon phases, with and without an ephemeris table.
+
+    python -m unittest moon.tests.test_batch
+"""
+
+import unittest
+
+from moon import batch
+
+DAY = batch.SECONDS_PER_DAY
+
+
+@unittest.skipUnless(batch.NUMPY_AVAILABLE, "NumPy not installed")
+class MoonPhasesTest(unittest.TestCase):
+
+    def test_synodic_phases_follow_the_mean_month(self):
+        import numpy as np
+        new = batch.REFERENCE_NEW_MOON
+        month = batch.SYNODIC_MONTH_SECONDS
+        ts = np.array([new, new + month / 4, new + month / 2, new + 3 * month / 4,
+                       new + 100 * month, new - month / 2], dtype=np.int64)
+        self.assertEqual(batch.synodic_phase_codes(ts).tolist(), [0, 2, 4, 6, 0, 4])
+
+    def test_rows_outside_the_table_use_the_synodic_month(self):
+        import numpy as np
+
+        class Table:
+            def phase_codes(self, ts):
+                return np.where(ts < 0, -1, 7).astype(np.int8)
+
+        ts = np.array([-30 * DAY, 0, 30 * DAY], dtype=np.int64)
+        codes = batch.moon_phases(ts, ephemeris=Table())
+        self.assertEqual(codes.dtype, np.int8)
+        self.assertEqual(codes[1:].tolist(), [7, 7])
+        self.assertEqual(codes[0], batch.synodic_phase_codes(ts[:1])[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Temporal Refresher Tests
+========================
+Readers of the shared block fall back when it is torn, stale or foreign.
+
+    python -m unittest moon.tests.test_refresher
+"""
+
+import os
+import struct
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from moon import refresher
+from moon.refresher import (HEADER, REFRESHED_OFFSET, SEQ_OFFSET, SHARED_MEMORY_AVAILABLE,
+                            SharedCoordinates, TemporalRefresher, read_shared_coordinates)
+from moon.temporal import TemporalBinding
+
+COORDS = {'phase': 'full_moon', 'timestamp_utc': '2026-10-19T00:00:00+00:00'}
+
+
+@unittest.skipUnless(SHARED_MEMORY_AVAILABLE, "multiprocessing.shared_memory not available")
+class SharedCoordinatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.name = f"moon_temporal_test_{os.getpid()}_{time.monotonic_ns()}"
+        self.tmp = tempfile.TemporaryDirectory()
+        self.refresher = TemporalRefresher(name=self.name,
+                                           snapshot_path=os.path.join(self.tmp.name, "t.json"))
+        self.refresher._open_block()
+        self.refresher.publish(COORDS)
+        self.buf = self.refresher._block.buf
+
+        reader = mock.patch.object(refresher, 'SharedCoordinates',
+                                   lambda: SharedCoordinates(self.name))
+        reader.start()
+        self.addCleanup(reader.stop)
+        self.addCleanup(self._drop_reader)
+
+    def tearDown(self):
+        self.buf = None
+        self.refresher.stop()
+        self.tmp.cleanup()
+
+    def _drop_reader(self):
+        if refresher._reader is not None:
+            refresher._reader.close()
+            refresher._reader = None
+
+    def test_reads_published_coordinates(self):
+        coords = read_shared_coordinates()
+        self.assertEqual(coords['phase'], 'full_moon')
+        self.assertAlmostEqual(coords['refreshed_at'], time.time(), delta=5)
+
+    def test_touch_bumps_refreshed_at_under_seqlock(self):
+        seq = struct.unpack_from('<Q', self.buf, SEQ_OFFSET)[0]
+        self.refresher.touch()
+        self.assertEqual(struct.unpack_from('<Q', self.buf, SEQ_OFFSET)[0], seq + 2)
+
+    def test_torn_block_falls_back(self):
+        # A refresher that died between the odd and even seq writes
+        seq = struct.unpack_from('<Q', self.buf, SEQ_OFFSET)[0]
+        struct.pack_into('<Q', self.buf, SEQ_OFFSET, seq + 1)
+        self.assertIsNone(read_shared_coordinates())
+        self.assertIsNone(refresher._reader)
+
+        with mock.patch.object(TemporalBinding, 'get_all_temporal_coordinates',
+                               return_value={'phase': 'computed'}):
+            self.assertEqual(TemporalBinding.get_shared_coordinates(), {'phase': 'computed'})
+
+    def test_stale_block_falls_back(self):
+        struct.pack_into('<d', self.buf, REFRESHED_OFFSET, time.time() - 3600)
+        self.assertIsNone(read_shared_coordinates(max_age=60))
+        self.assertIsNone(refresher._reader)
+        self.assertEqual(read_shared_coordinates(max_age=None)['phase'], 'full_moon')
+
+    def test_foreign_block_falls_back(self):
+        self.buf[:4] = b'XXXX'
+        self.assertIsNone(read_shared_coordinates())
+        self.assertIsNone(refresher._reader)
+        self.assertEqual(HEADER.unpack_from(self.buf, 0)[0], b'XXXX')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Vault Module Loader
+===================
+Lazy, cached imports of the Moon modules that live in /mnt/Vault/Moon.
+
+Nothing touches the filesystem or sys.path until a Vault module is first
+needed. Each module is then imported once and the outcome is cached,
+failures of any kind included, so callers can ask on every request at
+the cost of a dict lookup.
+"""
+
+import importlib
+import sys
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Optional
+
+MOON_PATH = Path("/mnt/Vault/Moon")
+
+_modules: Dict[str, Optional[ModuleType]] = {}
+_lock = threading.Lock()
+_path_added = False
+
+
+def _add_moon_path():
+    """Put the Vault Moon directory on sys.path (once, if it exists)"""
+    global _path_added
+    if not _path_added:
+        if MOON_PATH.exists() and str(MOON_PATH) not in sys.path:
+            sys.path.insert(0, str(MOON_PATH))
+        _path_added = True
+
+
+def load(name: str) -> Optional[ModuleType]:
+    """
+    Import a Vault module on first use.
+
+    Args:
+        name: Module name, e.g. 'temporal_binding'
+
+    Returns:
+        The module, or None if importing it fails for any reason (also cached)
+    """
+    try:
+        return _modules[name]
+    except KeyError:
+        pass
+
+    with _lock:
+        if name not in _modules:
+            _add_moon_path()
+            try:
+                _modules[name] = importlib.import_module(name)
+            except Exception:
+                # Missing, or failing at import time: either way unusable
+                _modules[name] = None
+        return _modules[name]
+
+
+def available(name: str) -> bool:
+    """Whether a Vault module can be imported"""
+    return load(name) is not None
+
+
+def reset():
+    """Forget cached results, e.g. after the Vault was mounted"""
+    global _path_added
+    with _lock:
+        _modules.clear()
+        _path_added = False
@@ -5,20 +5,22 @@ Sovereign Verification System
 Wrapper for sovereign verification from /mnt/Vault/Moon
 """
 
-import sys
-from pathlib import Path
+from . import vault
 
-# Add Moon directory to path
-moon_path = Path("/mnt/Vault/Moon")
-if moon_path.exists() and str(moon_path) not in sys.path:
-    sys.path.insert(0, str(moon_path))
 
-try:
-    from sovereign_verification_system import SovereignVerificationSystem
-    VERIFICATION_AVAILABLE = True
-except ImportError:
-    VERIFICATION_AVAILABLE = False
-    SovereignVerificationSystem = None
+def _verifier_class():
+    """SovereignVerificationSystem from the Vault, or None (imported on first use)"""
+    module = vault.load('sovereign_verification_system')
+    return getattr(module, 'SovereignVerificationSystem', None)
+
+
+def __getattr__(name):
+    # Former import-time names, now resolved on first access
+    if name == 'VERIFICATION_AVAILABLE':
+        return _verifier_class() is not None
+    if name == 'SovereignVerificationSystem':
+        return _verifier_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class SovereignVerification:
@@ -31,16 +33,17 @@ class SovereignVerification:
     """
 
     def __init__(self):
-        if not VERIFICATION_AVAILABLE:
+        verifier_class = _verifier_class()
+        if verifier_class is None:
             raise RuntimeError("Sovereign verification not available")
 
-        self.verifier = SovereignVerificationSystem()
+        self.verifier = verifier_class()
         self._initialized = True
 
     @staticmethod
     def is_available():
         """Check if sovereign verification is available"""
-        return VERIFICATION_AVAILABLE
+        return _verifier_class() is not None
 
     def verify_all(self):
         """Run complete sovereign verification"""